@@ -1,6 +1,7 @@
 """
 Class to display and control user information.
 Loading page, next level, end game, score, level, highscore
+Positions are in logical units (see resolution.py) - font sizes are scaled to the screen resolution.
 """
 
 from turtle import *
@@ -9,11 +10,14 @@ LOADING_FONT = ("Arial", 60, "bold")
 PROGRESS_FONT = ("Arial", 40, "bold")
 LOADING_PAGE_FONT = ("Arial", 40, "normal")
 HEADING_FONT = ("Arial", 20, "bold")
+PROFILE_FONT = ("Courier", 10, "normal")
+PROGRESS_BAR_LENGTH = 15  # no. of characters in the loading progress bar
 
 
 class InfoDisplay:
-    def __init__(self, screen_dims, highscore):
-        self.screen_setup = screen_dims  # parent screen dimensions
+    def __init__(self, screen_dims, highscore, scale=1):
+        self.screen_setup = screen_dims  # parent screen dimensions - logical units
+        self.scale = scale  # screen pixels per logical unit
         # ------ hold the turtle text objects-------
         self.loading_text = None
         self.progress_bar = None
@@ -22,6 +26,7 @@ class InfoDisplay:
         self.current_score = None
         self.current_level = None
         self.highscore_turtle = None
+        self.profile_overlay = None
 
         self.progress = ""
         self.aliens_hit = 0
@@ -43,6 +48,13 @@ class InfoDisplay:
         self.boundary_line_y = self.screen_setup[1]/2 - (self.screen_setup[1]/2) / 10
         self.top_barrier_line = self.create_top_barrier()
 
+    def font(self, font):
+        """
+        returns the font with its size scaled to the screen resolution
+        """
+        name, font_size, style = font
+        return name, int(round(font_size * self.scale)), style
+
     def get_score(self):
         """
         return current score
@@ -59,7 +71,7 @@ class InfoDisplay:
         turtle.hideturtle()
         turtle.goto(self.screen_setup[0]/2 - ((self.screen_setup[0]/2) / 2.5),
                     - self.screen_setup[1]/2 + ((self.screen_setup[1]/2) / 13))
-        turtle.write("HIGHSCORE: ", move=False, font=HEADING_FONT, align="left")
+        turtle.write("HIGHSCORE: ", move=False, font=self.font(HEADING_FONT), align="left")
         return turtle
 
     def create_highscore(self, score=0, new_score=False):
@@ -73,11 +85,11 @@ class InfoDisplay:
             turtle.hideturtle()
             turtle.goto(self.screen_setup[0] / 2 - ((self.screen_setup[0] / 2) / 10),
                         - self.screen_setup[1] / 2 + ((self.screen_setup[1] / 2) / 13))
-            turtle.write(f"{score}", move=False, font=HEADING_FONT, align="left")
+            turtle.write(f"{score}", move=False, font=self.font(HEADING_FONT), align="left")
             self.highscore_turtle = turtle
         else:
             self.highscore_turtle.clear()
-            self.highscore_turtle.write(f"{score}", move=False, font=HEADING_FONT, align="left")
+            self.highscore_turtle.write(f"{score}", move=False, font=self.font(HEADING_FONT), align="left")
 
     def create_score_label(self):
         """
@@ -89,7 +101,7 @@ class InfoDisplay:
         turtle.hideturtle()
         turtle.goto(-self.screen_setup[0]/2 + ((self.screen_setup[0]/2) / 10),
                     self.screen_setup[1]/2 - ((self.screen_setup[1]/2) / 13))
-        turtle.write("SCORE: ", move=False, font=HEADING_FONT, align="left")
+        turtle.write("SCORE: ", move=False, font=self.font(HEADING_FONT), align="left")
         return turtle
 
     def create_level_label(self):
@@ -102,7 +114,7 @@ class InfoDisplay:
         turtle.hideturtle()
         turtle.goto(self.screen_setup[0]/2 - (self.screen_setup[0]/2) / 5,
                     self.screen_setup[1]/2 - (self.screen_setup[1]/2) / 13)
-        turtle.write("LEVEL: ", move=False, font=HEADING_FONT, align="right")
+        turtle.write("LEVEL: ", move=False, font=self.font(HEADING_FONT), align="right")
         return turtle
 
     def create_score(self, updated_score=False, score=None):
@@ -119,7 +131,7 @@ class InfoDisplay:
             turtle.hideturtle()
             turtle.goto(-self.screen_setup[0]/2 + ((self.screen_setup[0]/2) / 3),
                         self.screen_setup[1]/2 - ((self.screen_setup[1]/2) / 13))
-            turtle.write(f"{self.aliens_hit}", move=False, font=HEADING_FONT, align="left")
+            turtle.write(f"{self.aliens_hit}", move=False, font=self.font(HEADING_FONT), align="left")
             self.current_score = turtle
         else:  # update score
             if score == 0:  # for new game - reset score
@@ -127,7 +139,7 @@ class InfoDisplay:
             else:  # increment score
                 self.aliens_hit += 1
             self.current_score.clear()
-            self.current_score.write(f"{self.aliens_hit}", move=False, font=HEADING_FONT, align="left")
+            self.current_score.write(f"{self.aliens_hit}", move=False, font=self.font(HEADING_FONT), align="left")
 
     def create_level(self, updated_level=False, level=None):
         """
@@ -143,7 +155,7 @@ class InfoDisplay:
             turtle.hideturtle()
             turtle.goto(self.screen_setup[0]/2 - (self.screen_setup[0]/2) / 10,
                         self.screen_setup[1]/2 - (self.screen_setup[1]/2) / 13)
-            turtle.write(f"{self.player_level}", move=False, font=HEADING_FONT, align="right")
+            turtle.write(f"{self.player_level}", move=False, font=self.font(HEADING_FONT), align="right")
             self.current_level = turtle
         else:
             if level:
@@ -151,7 +163,7 @@ class InfoDisplay:
             else:
                 self.player_level += 1
             self.current_level.clear()
-            self.current_level.write(f"{self.player_level}", move=False, font=HEADING_FONT, align="right")
+            self.current_level.write(f"{self.player_level}", move=False, font=self.font(HEADING_FONT), align="right")
 
     def create_top_barrier(self):
         """
@@ -162,7 +174,7 @@ class InfoDisplay:
         turtle.penup()
         turtle.shape('square')
         ratio_x = self.screen_setup[0] / 20  # width of the screen
-        turtle.shapesize(stretch_len=ratio_x, stretch_wid=0.2)
+        turtle.shapesize(stretch_len=ratio_x * self.scale, stretch_wid=0.2 * self.scale)
         turtle.goto(0, self.screen_setup[1]/2 - (self.screen_setup[1]/2) / 10)
         return turtle
 
@@ -176,7 +188,7 @@ class InfoDisplay:
         turtle.color("green")
         turtle.goto(0, (self.screen_setup[1]/2)/2)
         turtle.write(f". . .GAME OVER. . .\n\n Reached level: {level}\n\nScore: {self.aliens_hit}",
-                     move=False, font=PROGRESS_FONT, align="center")
+                     move=False, font=self.font(PROGRESS_FONT), align="center")
         self.game_end_text = turtle
 
     def reset_info_text(self):
@@ -201,7 +213,7 @@ class InfoDisplay:
         turtle.color("green")
         turtle.goto(0, (self.screen_setup[1]/2)/2)
         turtle.write(f"NEXT LEVEL\n\n Level: {level}",
-                     move=False, font=PROGRESS_FONT, align="center")
+                     move=False, font=self.font(PROGRESS_FONT), align="center")
         self.next_level_text = turtle
 
     def remove_loading_page(self):
@@ -211,8 +223,9 @@ class InfoDisplay:
         if self.loading_text:
             self.loading_text.hideturtle()
             self.loading_text.clear()
-        self.progress_bar.hideturtle()
-        self.progress_bar.clear()
+        if self.progress_bar:
+            self.progress_bar.hideturtle()
+            self.progress_bar.clear()
 
     def remove_next_level_text(self):
         """
@@ -231,24 +244,49 @@ class InfoDisplay:
         turtle.hideturtle()
         turtle.color('green')
         turtle.goto(0, (self.screen_setup[1]/2)/2)
-        turtle.write("SPACE INVADERS", move=False, font=LOADING_FONT, align="center")
+        turtle.write("SPACE INVADERS", move=False, font=self.font(LOADING_FONT), align="center")
         self.loading_text = turtle
 
-    def create_progress_bar(self):
+    def update_progress_bar(self, fraction):
         """
-        displays an incrementing progress bar - to reflect game loading
+        displays a progress bar - to reflect game loading.
+        fraction: fraction of the game loaded (0 to 1).
+        Creates the progress bar turtle on first call - after that the text is only rewritten
+        when the bar grows
         """
-        if self.progress_bar:  # remove previous turtle
-            self.progress_bar.hideturtle()
-            self.progress_bar.clear()
-            self.progress_bar = None
-        # create turtle progress bar text
-        self.progress += "#"
-        turtle = Turtle()
-        turtle.penup()
-        turtle.hideturtle()
-        turtle.goto(0, 0)
-        turtle.color("green")
-        turtle.write(f"{self.progress.ljust(15, "-")}",
-                     move=False, font=LOADING_PAGE_FONT, align="center")
-        self.progress_bar = turtle
+        progress = "#" * int(fraction * PROGRESS_BAR_LENGTH)
+        if self.progress_bar and progress == self.progress:
+            return  # bar unchanged
+
+        if self.progress_bar is None:
+            # create turtle progress bar text
+            turtle = Turtle()
+            turtle.penup()
+            turtle.hideturtle()
+            turtle.goto(0, 0)
+            turtle.color("green")
+            self.progress_bar = turtle
+        self.progress = progress
+        self.progress_bar.clear()
+        self.progress_bar.write(f"{self.progress.ljust(PROGRESS_BAR_LENGTH, "-")}",
+                                move=False, font=self.font(LOADING_PAGE_FONT), align="center")
+
+    def update_profile_overlay(self, text):
+        """
+        displays the profiler summary text (FPS and time per loop phase) below the score.
+        Creates the overlay turtle on first call
+        """
+        if not self.profile_overlay:
+            turtle = Turtle()
+            turtle.color("yellow")
+            turtle.penup()
+            turtle.hideturtle()
+            turtle.goto(-self.screen_setup[0]/2 + ((self.screen_setup[0]/2) / 10),
+                        self.screen_setup[1]/2 - ((self.screen_setup[1]/2) / 5))
+            self.profile_overlay = turtle
+        self.profile_overlay.clear()
+        # text is written upwards from the turtle - shift down by no. of lines
+        line_height = PROFILE_FONT[1] * 1.6
+        self.profile_overlay.sety(self.screen_setup[1]/2 - ((self.screen_setup[1]/2) / 5)
+                                  - line_height * text.count("\n"))
+        self.profile_overlay.write(text, move=False, font=self.font(PROFILE_FONT), align="left")
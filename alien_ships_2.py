@@ -4,44 +4,118 @@ class to create and control alien ship functionality
 - moving
 - shooting
 - resetting
+
+The formation is stored as a single origin (centre of the top left alien) plus a
+rows x columns alive mask - marching only updates the origin, and each alien entity
+reads its position from the origin and its row / column.
+A single entity is kept per alien - animating swaps its shape between the original
+and moving alien gif images.
+
+Alive counts per row and column, the formation bounds (top / bottom alive row, left / right
+alive column) and the lowest alive alien of each column are kept up to date on each kill -
+so bounds queries don't rescan the alive mask.
 """
 
-from turtle import *
-from PIL import Image
-import operator
+from entities import Entity, EntityPool
+from shapes import ship_size
+import math
 import random
 
-# dictionary for mapping character to comparison operator
-operator_dict = {
-    ">": operator.gt,
-    "<": operator.lt}
+ROW_FILL = 0.75  # max fraction of the y-axis spacing an alien img fills - keeps a gap between rows
+
+
+def formation_spacing(size, rows=5, columns=11):
+    """
+    returns the alien (x, y) spacing of a rows x columns formation - screen / 17 and screen / 15
+    for the default formation. Tall formations are packed closer, so the bottom row starts above the
+    screen centre - leaving the aliens room to march down before reaching the blocks
+    """
+    spacing_x = size[0] / (columns + 6)
+    # the starting origin puts the bottom row (3 x rows - 1) / 2 spacings below the top of the screen
+    spacing_y = min(size[1] / (rows + 10), size[1] / (3 * rows - 1))
+    return spacing_x, spacing_y
+
+
+def alien_size(size, rows=5, columns=11):
+    """
+    returns the (w, h) of the alien imgs in logical units - a ship sized to the x-axis spacing
+    (see shapes.ship_size), shrunk if needed to fit the y-axis spacing
+    """
+    spacing_x, spacing_y = formation_spacing(size, rows, columns)
+    width, height = ship_size(size, per_row=columns + 6)
+    fit = min(1, spacing_y * ROW_FILL / height)
+    return width * fit, height * fit
+
+
+class AlienEntity(Entity):
+    """
+    alien entity positioned relative to the formation origin,
+    with the shape of the formations current animation frame
+    """
+    def __init__(self, formation, row, column):
+        super().__init__(formation.alien_shape(row))
+        self.formation = formation  # parent AlienShips
+        self.row = row
+        self.column = column
+
+    def xcor(self):
+        return self.formation.alien_x(self.column)
+
+    def ycor(self):
+        return self.formation.alien_y(self.row)
+
+    def shape(self, name=None):
+        return self.formation.alien_shape(self.row)
 
 
 class AlienShips:
-    def __init__(self, size, shape_img, shape_img_moving):
+    def __init__(self, size, shape_img, shape_img_moving, rows=5, columns=11, shot_pool_capacity=20, rng=None):
 
         self.alien_img_list = list(shape_img)  # list of original alien gif images
         self.alien_img_list_moving = list(shape_img_moving)  # list of moving (2nd) alien gif images
-        self.alien_img_dims = self.get_alien_dimensions()  # list of gif img dimensions
-        self.screen_size = size  # parent screen dimensions
-        self.ship_spacing_x = self.screen_size[0] / 17  # alien x-axis spacing
-        self.ship_spacing_y = self.screen_size[1] / 15  # alien y-axis spacing
+        self.screen_size = size  # parent screen dimensions - logical units
+        self.rng = rng or random.Random()  # random number generator - seeded for repeatable games
 
-        # create alien turtles for 1st and 2nd set of alien img gif shapes
-        self.alien_ship_list = self.create_all_aliens(self.alien_img_list)
-        self.alien_ship_list_moving = self.create_all_aliens(self.alien_img_list_moving)
+        # formation dimensions - default 5 rows and 11 aliens per row
+        self.rows = rows
+        self.columns = columns
+        # alien x-axis and y-axis spacing
+        self.ship_spacing_x, self.ship_spacing_y = formation_spacing(self.screen_size, self.rows, self.columns)
+        self.alien_img_dims = self.get_alien_dimensions()  # list of gif img dimensions - logical units
+
+        # index of the alien img for each row
+        self.row_shapes = self.get_row_shapes()
+
+        # formation origin (centre of the top left alien) and alive flag per alien
+        self.origin_x, self.origin_y = self.get_starting_origin()
+        self.alive = [[True] * self.columns for _ in range(self.rows)]
+
+        # flag indicating which alien img is currently displayed
+        self.first_shape_list = True
+
+        # create alien entities - one per alien
+        self.alien_ship_list = self.create_all_aliens()
+
+        # alive counts and formation bounds - updated on each kill
+        self.row_counts = []  # no. of aliens alive per row
+        self.column_counts = []  # no. of aliens alive per column
+        self.top_row = 0  # index of the top row with an alien alive
+        self.bottom_row = 0  # index of the bottom row with an alien alive
+        self.left_column = 0  # index of the furthest left column with an alien alive
+        self.right_column = 0  # index of the furthest right column with an alien alive
+        self.column_lowest = []  # row index of the lowest alien alive per column (-1 if none)
+        self.lowest_aliens = []  # entity of the lowest alien alive per column
+        self.reset_bounds()
 
         # container for all alien shots fired
         self.shots_fired = []
-
-        # variable holding no. of columns originally
-        self.original_column_length = len(self.alien_ship_list[0])
+        # recycles shot entities - removed shots are returned to the pool
+        self.shot_pool = EntityPool("square", colour="red", stretch_wid=1, stretch_len=0.2,
+                                    capacity=shot_pool_capacity)
 
         # total number of aliens visible
-        self.aliens_left = len(self.alien_ship_list) * len(self.alien_ship_list[0])
+        self.aliens_left = self.rows * self.columns
 
-        # flag indicating which alien img is currently displayed
-        self.first_shape_list = True
         # flag indicating current alien moving direction
         self.moving_right = True
         # flag indicating if one ship remaining
@@ -49,178 +123,221 @@ class AlienShips:
         # flag indicating if no more ships
         self.no_more_ships = False
 
+    def alien_x(self, column):
+        """
+        returns the x-axis of an alien column
+        """
+        return self.origin_x + column * self.ship_spacing_x
+
+    def alien_y(self, row):
+        """
+        returns the y-axis of an alien row
+        """
+        return self.origin_y - row * self.ship_spacing_y
+
+    def alien_shape(self, row):
+        """
+        returns the alien gif image for a row - in the currently displayed animation frame
+        """
+        img_list = self.alien_img_list if self.first_shape_list else self.alien_img_list_moving
+        return img_list[self.row_shapes[row]]
+
     def get_highest_y_axis(self):
         """
         returns the top visible aliens rows y-axis
         """
-        # ensures returned items are not None
-        top_row = [alien for alien in self.alien_ship_list[0] if alien]
-        top_row_y_axis = top_row[0].ycor()
-        return top_row_y_axis
+        return self.alien_y(self.top_row)
 
     def get_lowest_y_axis(self):
         """
         returns the bottom visible aliens rows y-axis
         """
-        # ensures returned items are not None
-        bottom_row = [alien for alien in self.alien_ship_list[-1] if alien]
-        bottom_row_y_axis = bottom_row[0].ycor()
-        return bottom_row_y_axis
+        return self.alien_y(self.bottom_row)
 
     def get_lowest_visible_aliens(self):
         """
         return a list of the lowest visible aliens showing for each column
         """
-        lowest_alien_list = []  # list holding lowest aliens (1 per row max)
-
-        # variable to hold the current showing alien list
-        alien_list = self.alien_ship_list if self.first_shape_list else self.alien_ship_list_moving
-
-        # for each column
-        for j in range(self.original_column_length):
-            lowest_i = None
-            # iterate over each row
-            for i, row in enumerate(alien_list):
-                if row[j]:  # if alien is visible (not None) in next row
-                    lowest_i = i  # assign i to lowest_i
-
-            if lowest_i is not None:  # i.e. there is an alien showing in that column
-                lowest_alien_list.append(alien_list[lowest_i][j])  # add that alien to list
+        return self.lowest_aliens
 
-        return lowest_alien_list
-
-    def check_shot_in_range(self, shot_y, shot_x):
+    def reset_bounds(self):
+        """
+        resets the alive counts and formation bounds - every alien alive
+        """
+        self.row_counts = [self.columns] * self.rows
+        self.column_counts = [self.rows] * self.columns
+        self.top_row = 0
+        self.bottom_row = self.rows - 1
+        self.left_column = 0
+        self.right_column = self.columns - 1
+        self.column_lowest = [self.rows - 1] * self.columns
+        self.lowest_aliens = list(self.alien_ship_list[-1])
+
+    def update_bounds(self, i, j):
         """
-        Checks if a shot will hit an alien turtle.
-        If hit - then removes the turtle from display and deletes the turtle.
-         - assigns None in place of Turtle object
-         - removes entire row from alien turtle lists if all items in row are None
+        updates the alive counts and formation bounds after the alien at row i, column j is killed.
+        Only the killed aliens row and column are searched - and only if they were a bound
         """
+        self.row_counts[i] -= 1
+        self.column_counts[j] -= 1
+        if not self.aliens_left:
+            return  # no bounds left
+
+        # move each bound inwards past any now empty rows / columns
+        while not self.row_counts[self.top_row]:
+            self.top_row += 1
+        while not self.row_counts[self.bottom_row]:
+            self.bottom_row -= 1
+        while not self.column_counts[self.left_column]:
+            self.left_column += 1
+        while not self.column_counts[self.right_column]:
+            self.right_column -= 1
+
+        # if killed alien was the lowest in its column - search up for the next alien alive
+        if self.column_lowest[j] == i:
+            lowest = i - 1
+            while lowest >= 0 and not self.alive[lowest][j]:
+                lowest -= 1
+            self.column_lowest[j] = lowest
+            self.lowest_aliens = [self.alien_ship_list[self.column_lowest[k]][k]
+                                  for k in range(self.columns) if self.column_lowest[k] >= 0]
+
+    def check_shot_in_range(self, shot_y, shot_x, start_y=None):
+        """
+        Checks if a shot will hit an alien - swept from start_y (the shots y-axis at the start
+        of the tick) up to shot_y, so a fast shot can't pass through an alien between ticks.
+        The column, and the rows on the shots path, are calculated from the formation origin
+        and spacing - aliens are narrower than the spacing, so only the nearest column can be hit.
+        If hit - then the alien is killed (see kill_alien)
+        """
+        if start_y is None:
+            start_y = shot_y
 
-        # pixels y and x-axis offset from alien turtle img centre
+        # pixels y and x-axis offset from alien img centre
         y_axis_offset = self.alien_img_dims[0][1]/2
         x_axis_offset = self.alien_img_dims[0][0]/2
 
-        # assign current and next alien list dependent on which is currently visible
-        if self.first_shape_list:
-            alien_list = list(reversed(self.alien_ship_list))
-            next_alien_list = list(reversed(self.alien_ship_list_moving))
-        else:
-            alien_list = list(reversed(self.alien_ship_list_moving))
-            next_alien_list = list(reversed(self.alien_ship_list))
-
-        num_rows = len(self.alien_ship_list)-1  # last index of the list
-
-        for i, row in enumerate(alien_list):
-            available_aliens_row = [alien for alien in row if alien]  # get all alien Turtles (visible) in current row
-            # if shot y-axis within spaceship y-axis
-            if (available_aliens_row[0].ycor() - y_axis_offset # bottom of alien img
-                    <= shot_y <=
-                    available_aliens_row[0].ycor() + y_axis_offset):  # top of alien img
-
-                # for each alien ship of that row
-                for j, aliens_ship, in enumerate(row):
-
-                    if aliens_ship:  # if not hit previously / not None
-
-                        # if shot x axis is within the alien x-axis
-                        if (aliens_ship.xcor() - x_axis_offset  # left side of alien img
-                                <= shot_x <=
-                                aliens_ship.xcor() + x_axis_offset):  # right side of alien img
-
-                            # hide and clear alien turtle in both lists
-                            alien_list[i][j].hideturtle()
-                            alien_list[i][j].clear()
-                            next_alien_list[i][j].hideturtle()
-                            next_alien_list[i][j].clear()
-                            # assign to None to remove resources
-                            alien_list[i][j] = None
-                            next_alien_list[i][j] = None
-
-                            self.aliens_left -= 1  # decrement no. of aliens left
+        # nearest column to the shot - if shot x axis is within the alien x-axis
+        j = round((shot_x - self.origin_x) / self.ship_spacing_x)
+        if not self.left_column <= j <= self.right_column:
+            return False
+        if abs(shot_x - self.alien_x(j)) > x_axis_offset:
+            return False  # shot between columns
+
+        # rows with a y-axis overlapping the shots path - limited to the alive rows
+        top_i = max(math.ceil((self.origin_y - y_axis_offset - shot_y) / self.ship_spacing_y), self.top_row)
+        i = min(math.floor((self.origin_y + y_axis_offset - start_y) / self.ship_spacing_y), self.bottom_row)
+
+        # check rows from the bottom up - the lowest alien is hit first
+        while i >= top_i:
+            if self.alive[i][j]:  # if not hit previously
+                self.kill_alien(i, j)
+                return True  # true if alien has been hit
+            i -= 1
+        return False  # false if not hit
 
-                            if self.aliens_left == 1:
-                                self.last_ship = True
+    def kill_alien(self, i, j):
+        """
+        removes the alien at row i, column j from display and the alive mask.
+        - assigns None in place of the Entity object
+        """
+        self.alive[i][j] = False
+        self.alien_ship_list[i][j].remove()
+        self.alien_ship_list[i][j] = None  # assign to None to remove resources
 
-                            # if all items on this row are None (no aliens) - then remove the row
-                            if all(ship is None for ship in row):
-                                del self.alien_ship_list[num_rows-i]
-                                del self.alien_ship_list_moving[num_rows-i]
+        self.aliens_left -= 1  # decrement no. of aliens left
+        self.update_bounds(i, j)
 
-                            # if alien hit was the last alien
-                            if self.aliens_left == 0:
-                                self.last_ship = False
-                                self.no_more_ships = True
-
-                            return True  # true if alien has been hit
-        return False  # false if not hit
+        if self.aliens_left == 1:
+            self.last_ship = True
 
+        # if alien hit was the last alien
+        if self.aliens_left == 0:
+            self.last_ship = False
+            self.no_more_ships = True
 
     def reset_alien_ships(self):
         """
-        Removes and clears all previous alien turtles, and frees memory.
-        Recreates all alien turtles in original position
+        Removes and clears all previous alien entities, and frees memory.
+        Recreates all alien entities in original position
         """
-        # hide, clear, and delete any previous alien turtles
-        for alien_list in [self.alien_ship_list, self.alien_ship_list_moving]:
-            for i in range(len(alien_list)):
-                for j in range(len(alien_list[i])):
-                    if alien_list[i][j]:
-                        alien_list[i][j].hideturtle()
-                        alien_list[i][j].clear()
-                        alien_list[i][j] = None
+        self.clear_alien_ships()
+        for i in range(self.rows):
+            self.create_alien_row(i)
 
-        # recreate alien turtle lists
-        self.alien_ship_list = None
-        self.alien_ship_list = self.create_all_aliens(self.alien_img_list)
-        self.alien_ship_list_moving = None
-        self.alien_ship_list_moving = self.create_all_aliens(self.alien_img_list_moving)
+    def clear_alien_ships(self):
+        """
+        Removes and clears all previous alien entities, and resets the formation to its original
+        position - the alien entities are then recreated a row at a time by create_alien_row()
+        """
+        # remove and delete any previous alien entities
+        for i in range(len(self.alien_ship_list)):
+            for j in range(len(self.alien_ship_list[i])):
+                if self.alien_ship_list[i][j]:
+                    self.alien_ship_list[i][j].remove()
+                    self.alien_ship_list[i][j] = None
+
+        # reset the formation origin, animation frame and alive mask
+        self.origin_x, self.origin_y = self.get_starting_origin()
+        self.first_shape_list = True
+        self.alive = [[True] * self.columns for _ in range(self.rows)]
+        self.reset_bounds()
 
         # reset class variables and flags
-        self.first_shape_list = True
         self.moving_right = True
         self.last_ship = False
         self.no_more_ships = False
-        self.aliens_left = len(self.alien_ship_list) * len(self.alien_ship_list[0])
+        self.aliens_left = self.rows * self.columns
+
+    def create_alien_row(self, i, visible=True):
+        """
+        Recreates the alien entities of row i - after clear_alien_ships().
+        visible: False creates the row hidden, with its turtles preloaded - shown by show_all_aliens()
+        """
+        row = [AlienEntity(self, i, j) for j in range(self.columns)]
+        if not visible:
+            for alien_ship in row:
+                alien_ship.hideturtle()
+                alien_ship.preload()
+        self.alien_ship_list[i] = row
+        if i == self.rows - 1:  # every alien is alive - so the bottom row is the lowest of each column
+            self.lowest_aliens = list(row)
+
+    def show_all_aliens(self):
+        """
+        shows every alien entity
+        """
+        for row in self.alien_ship_list:
+            for alien_ship in row:
+                if alien_ship:
+                    alien_ship.showturtle()
 
     def remove_all_shots(self):
         """
-        Clears all alien shot turtles
+        Removes all alien shot entities
         """
         for shot in self.shots_fired:
-            shot.hideturtle()
-            shot.clear()
-            shot = None
+            shot.remove()
         self.shots_fired = []
 
     def add_shot(self, x, y):
         """
-        Adds an alien shot turtle at position x, y.
-        Returns a turtle object
+        Adds an alien shot entity (from the shot pool) at position x, y.
+        Returns an Entity object
         """
-        turtle = Turtle()
-        turtle.penup()
-        turtle.shape("square")
-        turtle.color('red')
-        turtle.shapesize(stretch_len=0.2, stretch_wid=1)
-        turtle.goto(x, y)
-        return turtle
+        return self.shot_pool.acquire(x, y)
 
     def random_shot(self):
         """
         Creates an alien shot - with coordinates from a random alien ship still visible
         """
-        available_alien_ship = []  # holds all visible ships
-        for i, row in enumerate(self.alien_ship_list):
-            for j, ship in enumerate(row):
-                if ship:  # if not None
-                    available_alien_ship.append(self.alien_ship_list[i][j])
+        # holds the row and column of all visible ships
+        available_alien_ship = [(i, j) for i, row in enumerate(self.alive) for j, alive in enumerate(row) if alive]
 
         # get random visible aliens coordinates - and create a shot
-        random_ship = random.choice(available_alien_ship)
-        coordinates = random_ship.pos()
-        self.shots_fired.append(self.add_shot(coordinates[0],
-                                              coordinates[1] - (self.alien_img_dims[0][1] / 2)))
+        i, j = self.rng.choice(available_alien_ship)
+        self.shots_fired.append(self.add_shot(self.alien_x(j),
+                                              self.alien_y(i) - (self.alien_img_dims[0][1] / 2)))
 
     def move_shots(self, move_amount=5):
         """
@@ -228,11 +345,12 @@ class AlienShips:
         """
         if len(self.shots_fired) > 0:
             for shot in self.shots_fired:
+                shot.start_y = shot.ycor()  # swept collision checks cover start_y to the new y-axis
                 shot.sety(shot.ycor() - move_amount)
 
     def move(self, move_amount=10):
         """
-        Moves all the ships by 'move_amount', dependent on current moving direction (L or R).
+        Moves the formation by 'move_amount', dependent on current moving direction (L or R).
         If moving alien ships would move ships passed the screen boundary - then aliens
           will instead move down the y-axis and the direction is reversed
         """
@@ -240,196 +358,111 @@ class AlienShips:
         # whether the move amount is positive or negative dependent on current direction
         direction = move_amount if self.moving_right else - move_amount
 
-        alien_lists = [self.alien_ship_list, self.alien_ship_list_moving]
-
         hit_wall = False
-        if self.check_hit_wall():  # if will not hit wall when moved
-            for alien_ships in alien_lists:
-                for row in alien_ships:
-                    for ship in row:
-                        if ship:  # if ship is not None
-                            ship.setx(ship.xcor() + direction)  # update the x-axis
+        if self.check_hit_wall(move_amount):  # if will not hit wall when moved
+            self.origin_x += direction  # update the x-axis
 
         else:  # if moving will hit wall when moved
-            for alien_ships in alien_lists:
-                for row in alien_ships:
-                    for ship in row:
-                        if ship:  # if ship is not None
-                            # move the alien down
-                            ship.sety(ship.ycor() - (self.ship_spacing_y/1.5))
+            self.origin_y -= self.ship_spacing_y/1.5  # move the aliens down
 
             # re-assign moving flag if hit wall
-            if self.moving_right:
-                self.moving_right = False
-            else:
-                self.moving_right = True
+            self.moving_right = not self.moving_right
 
             hit_wall = True
 
+        self.mark_aliens_dirty()  # every alien entity moved with the origin
         return hit_wall  # return hit wall indicator
 
-
-    # FINE - checks if hit the wall
-    def check_hit_wall(self):
+    def check_hit_wall(self, move_amount=10):
         """
         checks if the move amount applied to the aliens would cause the aliens to be passed the screen width.
         Returns True if move amount will not go passed the screen, False if will go passed the screen.
         """
+        half_width = self.alien_img_dims[0][0] / 2
 
-        def get_furthest_left_index():
-            """
-            returns the furthest left alien index
-            - breaks early if column index = 0
-            """
-            current_alien_list = self.alien_ship_list if self.first_shape_list else self.alien_ship_list_moving
-            furthest_row = 0
-            furthest_column = 20  # random high num, greater than any column index
-            for i, row in enumerate(current_alien_list):
-                for j, ship in enumerate(row):
-                    if ship:  # if Turtle (not None)
-                        # if column index is less that furthest column
-                        if j < furthest_column:
-                            # assign as furthest
-                            furthest_row = i
-                            furthest_column = j
-                        if furthest_column == 0:  # break early if index at 0 (none further left)
-                            return furthest_row, furthest_column
-            return furthest_row, furthest_column
-
-        def get_furthest_right_index():
-            """
-            returns the furthest right alien index
-            - breaks early if column index = max column index
-            """
-            current_alien_list = self.alien_ship_list if self.first_shape_list else self.alien_ship_list_moving
-            max_column_index = len(self.alien_ship_list[0]) - 1
-            furthest_row = 0
-            furthest_column = 0
-            for i, row in enumerate(current_alien_list):
-                for j, ship in enumerate(row):
-                    if ship:  # if Turtle (not None)
-                        # if column index greater than furthest column
-                        if j > furthest_column:
-                            # assign as furthest
-                            furthest_row = i
-                            furthest_column = j
-                        if j == max_column_index:  # break early if index at max column index
-                            return furthest_row, furthest_column
-            return furthest_row, furthest_column
-
-        # assign variables dependent on if moving left or right
         if self.moving_right:
-            move = 10
-            greater_lesser = ">"
-            positive_negative = 1
-            furthest_index = get_furthest_right_index()
-        else:
-            move = -10
-            greater_lesser = "<"
-            positive_negative = -1
-            furthest_index = get_furthest_left_index()
-
-        # comparison operator between the furthest left or right alien to the left or right screen side
-        if operator_dict[greater_lesser](
-                self.alien_ship_list[furthest_index[0]][furthest_index[1]].xcor()
-                + (positive_negative * self.alien_img_dims[0][0] / 2) + move,
-                (positive_negative * self.screen_size[0] / 2)):
-            return False  # false if will pass the screen
-        else:
-            return True  # True if does not pass the screen
+            # right side of the furthest right alien
+            return self.alien_x(self.right_column) + half_width + move_amount <= self.screen_size[0] / 2
+        # left side of the furthest left alien
+        return self.alien_x(self.left_column) - half_width - move_amount >= -self.screen_size[0] / 2
 
     def switch_ships(self, switch=True):
         """
-        Changes which list of alien turtles is visible - gives the effect of the img is moving.
-        Switch set to True - makes the previously hidden alien list visible.
+        Swaps the displayed alien img between the original and moving gif - gives the effect of the img is moving.
+        Each alien entity reads its shape from the current frame, so only the flag changes.
+        Switch set to False - hides all the aliens instead (end of level / game).
         """
-        # get current visible alien list and hidden alien list
-        if self.first_shape_list:
-            current_alien_list = self.alien_ship_list
-            next_alien_list = self.alien_ship_list_moving
-            self.first_shape_list = False  # reverse flag
+        if switch:
+            self.first_shape_list = not self.first_shape_list  # reverse flag
+            self.mark_aliens_dirty()
         else:
-            current_alien_list = self.alien_ship_list_moving
-            next_alien_list = self.alien_ship_list
-            self.first_shape_list = True  # reverse flag
+            # hide each alien entity
+            for row in self.alien_ship_list:
+                for alien_ship in row:
+                    if alien_ship:
+                        alien_ship.hideturtle()
 
-        # hide each alien turtle
-        for row in current_alien_list:
+    def mark_aliens_dirty(self):
+        """
+        queues every alien entity to be rendered - after the formation origin or animation frame changes
+        """
+        for row in self.alien_ship_list:
             for alien_ship in row:
                 if alien_ship:
-                    alien_ship.hideturtle()
-                    alien_ship.clear()
-        if switch:
-            # display each alien turtle
-            for i, row in enumerate(next_alien_list):
-                for j, alien_ship in enumerate(row):
-                    if alien_ship:
-                        alien_ship.showturtle()
+                    alien_ship.mark_dirty()
 
     def get_alien_dimensions(self):
         """
-        gets the alien img height and width dimensions
+        gets the alien img height and width dimensions - in logical units, from the logical img size
+        (not the rounded GIF pixels) so collisions don't change with the resolution.
+        The alien imgs must be made at alien_size() for the formation (see game.load_game_icons)
         """
-        dimensions = []
-        for alien_img in self.alien_img_list:
-            img = Image.open(alien_img)
-            width = img.width
-            height = img.height
-            dimensions.append([width, height])
-        return dimensions
+        return [list(alien_size(self.screen_size, self.rows, self.columns)) for _ in self.alien_img_list]
 
-    def create_all_aliens(self, img_list):
+    def get_row_shapes(self):
         """
-        Creates all alien turtles - default 5 rows and 11 aliens per column
-        Calculates the alien turtle spacing based on ship_spacing_x and ship_spacing_y.
-        'img_list' = a list of alien img gif file (previously registered as turtle shapes
+        returns the alien img index for each row - the top fifth of rows use the 1st img,
+        the next two fifths the 2nd img, and the remaining rows the 3rd img
+        """
+        row_shapes = []
+        for i in range(self.rows):
+            if i < self.rows / 5:
+                row_shapes.append(0)
+            elif i < self.rows * 3 / 5:
+                row_shapes.append(1)
+            else:
+                row_shapes.append(2)
+        return row_shapes
+
+    def get_starting_origin(self):
+        """
+        Calculates the starting position of the top left alien - so the formation is centred on the x-axis
         """
         # 1. calc the initial x-axis position
-        # width of the available screen that will hold alien turtles
-        ship_container_size_x = self.ship_spacing_x * 11
+        # width of the available screen that will hold alien entities
+        ship_container_size_x = self.ship_spacing_x * self.columns
         # position of this alien container width so it is centred - left x coordinate
         left_side_offset = - self.screen_size[0] / 2 + ((self.screen_size[0] - ship_container_size_x)/2)
         # then centre the x-axis position:
-        initial_x_centred = left_side_offset + (self.ship_spacing_x /2)
-        starting_x = initial_x_centred
+        initial_x_centred = left_side_offset + (self.ship_spacing_x / 2)
 
         # 2. calc the initial y-axis position
-        ship_container_size_y = self.ship_spacing_y * 5  # container size for aliens - y-axis
+        ship_container_size_y = self.ship_spacing_y * self.rows  # container size for aliens - y-axis
         top_side_offset = self.screen_size[1] / 2 - (ship_container_size_y/2)  # length from top of screen
-        initial_y_centred = top_side_offset - (self.ship_spacing_y /2)  # subtracting img dims y-axis
-        starting_y = initial_y_centred
+        initial_y_centred = top_side_offset - (self.ship_spacing_y / 2)  # subtracting img dims y-axis
 
+        return initial_x_centred, initial_y_centred
 
+    def create_all_aliens(self):
+        """
+        Creates all alien entities - one per formation row and column.
+        The alien gif images must be registered turtle shapes when rendered.
+        """
         alien_ships_container = []
-        for i in range(5):  # for each row
-            # which rows will have which alien gif image
-            if i < 1:
-                alien_img = img_list[0]
-            elif i < 3:
-                alien_img = img_list[1]
-            else:
-                alien_img = img_list[2]
-
+        for i in range(self.rows):  # for each row
             row = []
-            for j in range(11):  # per column
-                row.append(self.create_ship(alien_img,
-                                            starting_x,
-                                            starting_y))  # create turtle with alien gif image
-                starting_x += self.ship_spacing_x  # increment the x-axis position
-            starting_y -= self.ship_spacing_y  # increment the y-axis position
-            starting_x = initial_x_centred  # reset the x-axis position to far left
+            for j in range(self.columns):  # per column
+                row.append(AlienEntity(self, i, j))  # entity with alien gif image for this row
             alien_ships_container.append(row)
 
         return alien_ships_container
-
-    def create_ship(self, alien_shape, x, y):
-        """
-        Create a turtle object with alien img.
-        Alien shape must be a registered turtle shape.
-        """
-        turtle = Turtle()
-        turtle.penup()
-        turtle.shape(alien_shape)
-        turtle.goto(x, y)
-        return turtle
-
@@ -0,0 +1,132 @@
+"""
+Background images - the parts of the screen that never change, drawn once with PIL and shown
+behind everything with screen.bgpic(), instead of a canvas item per star dot and a turtle per line
+- Starfield renders the stars into GIF images, cached by screen size, no. of stars, seed and star style.
+  Extra frames make a few stars twinkle - cycling the frames animates the stars with a single image
+- StaticLayer draws the boundary lines over a starfield frame
+- positions are in logical units (see resolution.py), converted to image pixels by the resolution scale
+"""
+
+from PIL import Image, ImageColor, ImageDraw
+from shapes import save_atomic
+import hashlib
+import os
+import random
+
+STAR_COLOURS = ["white", "lightyellow", "lightblue"]
+TWINKLE_FRACTION = 0.2  # fraction of stars dimmed in each extra frame
+TWINKLE_BRIGHTNESS = 0.35  # brightness of a dimmed star
+
+
+def img_size(resolution):
+    """
+    returns the (w, h) pixels of a whole screen image
+    """
+    return int(round(resolution.screen_size[0])), int(round(resolution.screen_size[1]))
+
+
+class Starfield:
+    def __init__(self, resolution, num_stars=200, seed=0, frames=1, img_folder="./game_icons"):
+
+        self.resolution = resolution
+        self.img_size = img_size(resolution)  # image (w, h) pixels - whole screen
+        self.num_stars = num_stars
+        self.seed = seed  # the star layout (and twinkles) are the same for the same seed
+        self.frames = frames  # no. of images - more than 1 makes the stars twinkle
+        self.img_folder = img_folder
+
+    @staticmethod
+    def style_key():
+        """
+        returns a short hash of the star colours and twinkle settings - so cached frames
+        are re-rendered when the star style changes
+        """
+        style = repr((STAR_COLOURS, TWINKLE_FRACTION, TWINKLE_BRIGHTNESS))
+        return hashlib.md5(style.encode()).hexdigest()[:8]
+
+    def frame_file(self, frame):
+        """
+        returns the GIF file name of a frame - unique per screen size, no. of stars, seed and star style
+        """
+        return os.path.join(self.img_folder, f"starfield_{self.img_size[0]}x{self.img_size[1]}"
+                                             f"_{self.num_stars}_{self.seed}_{self.style_key()}_{frame}.gif")
+
+    def get_frames(self):
+        """
+        returns the GIF files of each starfield frame - frames not already cached are rendered
+        """
+        files = [self.frame_file(frame) for frame in range(self.frames)]
+        if not all(os.path.isfile(file) for file in files):
+            os.makedirs(self.img_folder, exist_ok=True)
+            stars = self.make_stars()
+            for frame, file in enumerate(files):
+                img = self.make_frame(stars, frame)
+                save_atomic(file, lambda temp_file: img.save(temp_file, format="GIF"))
+        return files
+
+    def make_stars(self):
+        """
+        returns a random (x, y, diameter, colour) pixel position, size and colour per star
+        """
+        rng = random.Random(self.seed)
+        stars = []
+        for _ in range(self.num_stars):
+            x = rng.randint(0, self.img_size[0])
+            y = rng.randint(0, self.img_size[1])
+            diameter = rng.randint(2, 6) * self.resolution.scale
+            stars.append((x, y, diameter, rng.choice(STAR_COLOURS)))
+        return stars
+
+    def make_frame(self, stars, frame):
+        """
+        draws a frame of the starfield - frame 0 has every star at full brightness,
+        each further frame dims a different random selection of stars
+        """
+        rng = random.Random(f"{self.seed}-{frame}")
+        dimmed = set(rng.sample(range(len(stars)), int(len(stars) * TWINKLE_FRACTION))) if frame else set()
+
+        img = Image.new("RGB", self.img_size, "black")
+        draw = ImageDraw.Draw(img)
+        for i, (x, y, diameter, colour) in enumerate(stars):
+            rgb = ImageColor.getrgb(colour)
+            if i in dimmed:
+                rgb = tuple(int(channel * TWINKLE_BRIGHTNESS) for channel in rgb)
+            radius = diameter / 2
+            draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=rgb)
+        return img
+
+
+class StaticLayer:
+    def __init__(self, resolution, base_file=None):
+
+        self.resolution = resolution
+        self.img_size = img_size(resolution)  # image (w, h) pixels - whole screen
+
+        if base_file:  # draw over an existing image (e.g. a starfield frame)
+            self.img = Image.open(base_file).convert("RGB")
+        else:
+            self.img = Image.new("RGB", self.img_size, "black")
+        self.draw = ImageDraw.Draw(self.img)
+
+    def to_pixels(self, x, y):
+        """
+        returns the image pixel of a logical x, y coordinate - the logical origin is the image centre
+        """
+        return (self.img_size[0] / 2 + self.resolution.to_pixels(x),
+                self.img_size[1] / 2 - self.resolution.to_pixels(y))
+
+    def add_line(self, y, width, thickness, colour):
+        """
+        draws a horizontal line centred on the x-axis at y - width and thickness in logical units
+        """
+        left, top = self.to_pixels(-width / 2, y + thickness / 2)
+        right, bottom = self.to_pixels(width / 2, y - thickness / 2)
+        self.draw.rectangle((left, top, right, bottom), fill=colour)
+
+    def save(self, img_file):
+        """
+        saves the layer as a GIF image (for screen.bgpic) - never left half written, see shapes.save_atomic()
+        Return: GIF file name
+        """
+        save_atomic(img_file, lambda temp_file: self.img.save(temp_file, format="GIF"))
+        return img_file
@@ -0,0 +1,205 @@
+"""
+Batch runner - plays many independent headless games across a process pool, for balancing
+- each game has its own seed, and is played by a random or scripted ('tracker') player policy
+- a game runs until the first game over, or the max no. of ticks
+- reports ticks per second, levels reached, the score distribution and shot counts
+
+    python batch.py --games 500 --policy tracker
+    python batch.py --games 500 --shoot-interval 16 --move-speed 12 --speed-factor 0.85 --json results.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from collections import Counter
+from multiprocessing import Pool
+from game import (make_headless_game, load_game_icons, GAME_OVER, LEVEL_COMPLETE,
+                  MOVE_LEFT, MOVE_RIGHT, MOVE_LEFT_FAST, MOVE_RIGHT_FAST, FIRE)
+
+
+class Policy:
+    """
+    base player policy - returns the input flags for each tick.
+    FIRE can be sent on any tick - the spaceship fire control limits the shots fired
+    """
+    def __init__(self, seed):
+        self.rng = random.Random(seed)  # separate from the games random number generator
+
+    def inputs(self, game, tick):
+        return 0
+
+
+class RandomPolicy(Policy):
+    """
+    moves in a random direction now and then, and fires at random
+    """
+    def inputs(self, game, tick):
+        inputs = 0
+        if self.rng.random() < 0.3:
+            inputs |= self.rng.choice((MOVE_LEFT, MOVE_RIGHT, MOVE_LEFT_FAST, MOVE_RIGHT_FAST))
+        if self.rng.random() < 0.1:
+            inputs |= FIRE
+        return inputs
+
+
+class TrackerPolicy(Policy):
+    """
+    moves under the nearest of the lowest aliens, and fires whenever lined up.
+    Lets go of the move keys close to the target, so the spaceship slows to a stop near it
+    """
+    def inputs(self, game, tick):
+        lowest_aliens = game.aliens.get_lowest_visible_aliens()
+        if not lowest_aliens:
+            return 0
+        ship_x = game.space_ship.main_ship.xcor()
+        target_x = min((alien.xcor() for alien in lowest_aliens), key=lambda x: abs(x - ship_x))
+
+        distance = target_x - ship_x
+        inputs = 0
+        if abs(distance) > 60:  # further than a fast move takes to stop
+            inputs |= MOVE_RIGHT_FAST if distance > 0 else MOVE_LEFT_FAST
+        elif abs(distance) > 12:
+            inputs |= MOVE_RIGHT if distance > 0 else MOVE_LEFT
+        if abs(distance) < game.aliens.alien_img_dims[0][0] / 2:
+            inputs |= FIRE
+        return inputs
+
+
+POLICIES = {
+    "random": RandomPolicy,
+    "tracker": TrackerPolicy,
+}
+
+
+def run_game(job):
+    """
+    plays a single headless game until game over or max_ticks - runs in a worker process.
+    job: (seed, policy name, max ticks, SpaceInvadersGame keyword arguments)
+    Return: dict of the games stats
+    """
+    seed, policy_name, max_ticks, game_kwargs = job
+    game = make_headless_game(seed=seed, **game_kwargs)
+    policy = POLICIES[policy_name](seed)
+
+    game_time = 0  # seconds the game would last in real time
+    game_over = False
+    start = time.perf_counter()
+    tick = 0
+    while tick < max_ticks:
+        outcome = game.tick(policy.inputs(game, tick))
+        game_time += game.speed
+        tick += 1
+        if outcome == GAME_OVER:
+            game_over = True
+            break
+        if outcome == LEVEL_COMPLETE:
+            game.end_level()
+            game.next_level()
+    wall_time = time.perf_counter() - start
+
+    player_shots = game.space_ship.shot_pool.stats()
+    alien_shots = game.aliens.shot_pool.stats()
+    return {
+        "seed": seed,
+        "ticks": tick,
+        "ticks_per_second": tick / wall_time,
+        "game_time": game_time,
+        "game_over": game_over,
+        "level": game.level,
+        "score": game.score,
+        "player_shots": player_shots["hits"] + player_shots["misses"],
+        "alien_shots": alien_shots["hits"] + alien_shots["misses"],
+    }
+
+
+def run_batch(games, policy="random", max_ticks=100000, seed=0, processes=None, **game_kwargs):
+    """
+    plays 'games' headless games across a process pool - game i uses seed + i.
+    Return: list of each games stats (in seed order), and the elapsed seconds
+    """
+    # create any missing sprite images once, for the games formation - before the workers read them
+    load_game_icons(alien_rows=game_kwargs.get("alien_rows", 5), alien_columns=game_kwargs.get("alien_columns", 11))
+
+    jobs = [(seed + i, policy, max_ticks, game_kwargs) for i in range(games)]
+    start = time.perf_counter()
+    with Pool(processes) as pool:
+        results = list(pool.imap_unordered(run_game, jobs))
+    elapsed = time.perf_counter() - start
+    return sorted(results, key=lambda result: result["seed"]), elapsed
+
+
+def summarise(results, elapsed):
+    """
+    returns the aggregate stats of a batch of games
+    """
+    scores = [result["score"] for result in results]
+    total_ticks = sum(result["ticks"] for result in results)
+    return {
+        "games": len(results),
+        "game_overs": sum(result["game_over"] for result in results),
+        "total_ticks": total_ticks,
+        "elapsed_s": elapsed,
+        "ticks_per_second": total_ticks / elapsed,  # across all processes
+        "ticks_per_second_per_game": statistics.mean(result["ticks_per_second"] for result in results),
+        "mean_game_time_s": statistics.mean(result["game_time"] for result in results),
+        "levels_reached": dict(sorted(Counter(result["level"] for result in results).items())),
+        "score": {
+            "mean": statistics.mean(scores),
+            "median": statistics.median(scores),
+            "min": min(scores),
+            "max": max(scores),
+            "deciles": statistics.quantiles(scores, n=10, method="inclusive") if len(scores) > 1 else scores,
+        },
+        "player_shots_per_game": statistics.mean(result["player_shots"] for result in results),
+        "alien_shots_per_game": statistics.mean(result["alien_shots"] for result in results),
+    }
+
+
+def print_summary(summary):
+    """
+    prints the aggregate stats
+    """
+    score = summary["score"]
+    print(f"{summary['games']} games ({summary['game_overs']} game overs) - "
+          f"{summary['total_ticks']} ticks in {summary['elapsed_s']:.1f} s")
+    print(f"ticks/s: {summary['ticks_per_second']:.0f} total, "
+          f"{summary['ticks_per_second_per_game']:.0f} per game")
+    print(f"mean game time: {summary['mean_game_time_s']:.1f} s")
+    print(f"levels reached: {summary['levels_reached']}")
+    print(f"score: mean {score['mean']:.1f}, median {score['median']}, min {score['min']}, max {score['max']}")
+    print(f"score deciles: {[round(decile, 1) for decile in score['deciles']]}")
+    print(f"shots per game: player {summary['player_shots_per_game']:.1f}, "
+          f"alien {summary['alien_shots_per_game']:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play many headless space invaders games in parallel")
+    parser.add_argument("--games", type=int, default=100, help="number of games to play")
+    parser.add_argument("--policy", choices=POLICIES, default="random", help="player policy")
+    parser.add_argument("--max-ticks", type=int, default=100000, help="max ticks per game")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game - game i uses seed + i")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--shoot-interval", type=int, default=20, help="starting ticks between alien shots")
+    parser.add_argument("--move-speed", type=int, default=15, help="starting ticks between alien moves")
+    parser.add_argument("--speed-factor", type=float, default=0.8, help="tick period multiplier per level")
+    parser.add_argument("--fire-cooldown", type=int, default=35, help="min ticks between player shots")
+    parser.add_argument("--max-shots", type=int, default=3, help="max player shots in flight")
+    parser.add_argument("--json", help="file to save the per game results and summary to")
+    args = parser.parse_args()
+
+    results, elapsed = run_batch(args.games, policy=args.policy, max_ticks=args.max_ticks, seed=args.seed,
+                                 processes=args.processes,
+                                 shoot_interval=args.shoot_interval,
+                                 alien_move_interval=args.move_speed,
+                                 level_speed_factor=args.speed_factor,
+                                 fire_cooldown=args.fire_cooldown,
+                                 max_shots=args.max_shots)
+    summary = summarise(results, elapsed)
+    print_summary(summary)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"settings": vars(args), "summary": summary, "games": results}, file, indent=2)
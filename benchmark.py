@@ -0,0 +1,288 @@
+"""
+Benchmark suite for the games hot paths - runs without a display
+- scripted scenarios: full formation, many shots, shield erosion, level transitions
+- reports per-function timings and memory allocations
+- JSON output, and comparison against a previous JSON run to catch regressions
+
+    python benchmark.py --repeat 200 --json results.json
+    python benchmark.py --compare results.json
+    python benchmark.py --render    # also time rendering, through a stubbed turtle backend
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+import entities
+import game_loop_logic
+from game import SpaceInvadersGame, load_game_icons
+from resolution import LOGICAL_SIZE
+
+SIZE = LOGICAL_SIZE
+ALLOCATION_REPEATS = 10  # runs traced for allocations - tracing slows down the timed runs
+
+
+class StubTurtle:
+    """
+    turtle backend that accepts every turtle call and draws nothing
+    """
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def stamp(self):
+        return 0
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def new_game(shot_pool_capacity=500, seed=0):
+    """
+    returns a game in its starting state - with an empty renderer
+    """
+    entities.clear_registry()
+    return SpaceInvadersGame(SIZE, *load_game_icons(SIZE), shot_pool_capacity=shot_pool_capacity, seed=seed)
+
+
+def add_shots(shot_list, shot_pool, n, x_range, y_range, rng):
+    """
+    adds n shots at random positions within the x and y ranges
+    """
+    for _ in range(n):
+        shot_list.append(shot_pool.acquire(rng.uniform(*x_range), rng.uniform(*y_range)))
+
+
+def clear_shots(game):
+    game.space_ship.remove_all_shots()
+    game.aliens.remove_all_shots()
+
+
+# ---------------------------- scenarios ----------------------------
+# each scenario returns {function name: (setup, run)} - setup is untimed, run is timed
+
+def full_formation(game, rng):
+    """
+    all 55 aliens alive - marching, animating and shooting
+    """
+    def setup_formation():
+        game.aliens.reset_alien_ships()
+        clear_shots(game)
+
+    def setup_tick():
+        setup_formation()
+        game.move_counter = game.alien_ship_move_speed  # march on the timed tick
+        game.shoot_counter = game.alien_shoot_interval  # and shoot
+
+    return {
+        "AlienShips.move": (setup_formation, game.aliens.move),
+        "AlienShips.switch_ships": (setup_formation, game.aliens.switch_ships),
+        "AlienShips.random_shot": (setup_formation, game.aliens.random_shot),
+        "SpaceInvadersGame.tick": (setup_tick, game.tick),
+    }
+
+
+def many_shots(game, rng, n_shots=200):
+    """
+    rapid fire - n_shots player shots in the shield and alien bands, n_shots alien shots in the shield band
+    """
+    blocks = game.blocks
+    shield_band = (blocks.block_bottom_y_axis, blocks.block_top_y_axis)
+    alien_band = (game.aliens.get_lowest_y_axis(), game.aliens.get_highest_y_axis())
+    x_range = (-SIZE[0] / 2, SIZE[0] / 2)
+
+    def setup_block_shots():
+        blocks.reset_bricks(rows=game.block_rows)
+        clear_shots(game)
+        add_shots(game.space_ship.shots_fired, game.space_ship.shot_pool, n_shots, x_range, shield_band, rng)
+
+    def setup_alien_shots():
+        game.aliens.reset_alien_ships()
+        clear_shots(game)
+        add_shots(game.space_ship.shots_fired, game.space_ship.shot_pool, n_shots, x_range, alien_band, rng)
+
+    def setup_move_shots():
+        clear_shots(game)
+        add_shots(game.aliens.shots_fired, game.aliens.shot_pool, n_shots, x_range, shield_band, rng)
+
+    return {
+        "check_shot_hit_block": (setup_block_shots,
+                                 lambda: game_loop_logic.check_shot_hit_block(game.space_ship.shots_fired, blocks)),
+        "check_shot_hit_alien": (setup_alien_shots,
+                                 lambda: game_loop_logic.check_shot_hit_alien(game.space_ship.shots_fired,
+                                                                              game.aliens, game.space_ship)),
+        "AlienShips.move_shots": (setup_move_shots, game.aliens.move_shots),
+    }
+
+
+def shield_erosion(game, rng):
+    """
+    full formation low enough for the bottom row to plough through the blocks
+    """
+    aliens, blocks = game.aliens, game.blocks
+
+    def setup():
+        aliens.reset_alien_ships()
+        blocks.reset_bricks(rows=game.block_rows)
+        # lower the formation so the bottom row overlaps the top of the blocks
+        aliens.origin_y = blocks.block_top_y_axis + (aliens.rows - 1) * aliens.ship_spacing_y
+
+    return {
+        "check_alien_hit_block": (setup, lambda: game_loop_logic.check_alien_hit_block(aliens, blocks)),
+    }
+
+
+def level_transitions(game, rng):
+    """
+    resetting the aliens and blocks between levels and games
+    """
+    def setup_level():
+        game.new_game_reset()
+        for i in range(len(game.blocks.masks)):  # damage every block
+            game.blocks.clear_rectangle(game.blocks.square_x(i, 2), game.blocks.square_x(i, 6),
+                                        game.blocks.square_y(4), game.blocks.square_y(1))
+
+    def next_level():
+        game.end_level()
+        game.next_level()
+
+    def new_game():
+        game.end_game()
+        game.new_game_reset()
+
+    return {
+        "Blocks.reset_bricks": (setup_level, lambda: game.blocks.reset_bricks(rows=game.block_rows)),
+        "AlienShips.reset_alien_ships": (setup_level, game.aliens.reset_alien_ships),
+        "SpaceInvadersGame.next_level": (setup_level, next_level),
+        "SpaceInvadersGame.new_game_reset": (setup_level, new_game),
+    }
+
+
+def rendering(game, rng):
+    """
+    syncing entities to the (stubbed) turtles after a march
+    """
+    def setup():
+        game.aliens.reset_alien_ships()
+        entities.render_all()  # first render creates the turtles
+        game.aliens.move()
+        game.aliens.switch_ships()
+
+    return {
+        "entities.render_all": (setup, entities.render_all),
+    }
+
+
+SCENARIOS = {
+    "full_formation": full_formation,
+    "many_shots": many_shots,
+    "shield_erosion": shield_erosion,
+    "level_transitions": level_transitions,
+}
+
+
+# ---------------------------- harness ----------------------------
+
+def measure(setup, run, repeat):
+    """
+    times run() 'repeat' times, each after an untimed setup(), then traces the
+    memory allocated by a few further runs.
+    Return: dict of timings (microseconds) and allocations (bytes)
+    """
+    timings = []
+    for _ in range(repeat):
+        setup()
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) * 1e6)
+
+    peak_allocated = 0
+    retained = 0
+    tracemalloc.start()
+    for _ in range(min(repeat, ALLOCATION_REPEATS)):
+        setup()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        run()
+        current, peak = tracemalloc.get_traced_memory()
+        peak_allocated = max(peak_allocated, peak - before)
+        retained = max(retained, current - before)
+    tracemalloc.stop()
+
+    return {
+        "mean_us": statistics.mean(timings),
+        "median_us": statistics.median(timings),
+        "min_us": min(timings),
+        "max_us": max(timings),
+        "peak_alloc_bytes": peak_allocated,
+        "retained_bytes": retained,
+    }
+
+
+def run_benchmarks(scenarios, repeat, seed=0, render=False):
+    """
+    runs each scenarios functions.
+    Return: {scenario: {function: measurement}}
+    """
+    if render:
+        entities.Turtle = StubTurtle  # exercise the renderer without a display
+        scenarios = dict(scenarios, rendering=rendering)
+    else:
+        entities.set_headless()
+
+    rng = random.Random(seed)
+    results = {}
+    for scenario_name, scenario in scenarios.items():
+        game = new_game(seed=seed)
+        results[scenario_name] = {}
+        for function_name, (setup, run) in scenario(game, rng).items():
+            results[scenario_name][function_name] = measure(setup, run, repeat)
+    return results
+
+
+def print_results(results, baseline=None):
+    """
+    prints a table of results - with the change from the baseline results if passed
+    """
+    header = f"{'function':<40}{'median us':>12}{'mean us':>12}{'peak alloc B':>14}"
+    if baseline:
+        header += f"{'vs baseline':>14}"
+    for scenario_name, functions in results.items():
+        print(f"\n{scenario_name}")
+        print(header)
+        for function_name, result in functions.items():
+            line = (f"{function_name:<40}{result['median_us']:>12.1f}{result['mean_us']:>12.1f}"
+                    f"{result['peak_alloc_bytes']:>14}")
+            previous = (baseline or {}).get(scenario_name, {}).get(function_name)
+            if previous:
+                line += f"{result['median_us'] / previous['median_us']:>13.2f}x"
+            print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the space invaders hot paths (no display)")
+    parser.add_argument("--repeat", type=int, default=100, help="timed runs per function")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the scenarios")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="scenario to run (default all)")
+    parser.add_argument("--render", action="store_true", help="include rendering through a stubbed turtle")
+    parser.add_argument("--json", help="file to save the results to")
+    parser.add_argument("--compare", help="JSON results file from a previous run to compare against")
+    args = parser.parse_args()
+
+    selected = {name: SCENARIOS[name] for name in args.scenario} if args.scenario else SCENARIOS
+    results = run_benchmarks(selected, args.repeat, seed=args.seed, render=args.render)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as file:
+            baseline = json.load(file)["results"]
+    print_results(results, baseline)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"python": platform.python_version(),
+                       "repeat": args.repeat,
+                       "seed": args.seed,
+                       "results": results}, file, indent=2)
@@ -2,14 +2,58 @@
 class for creating and managing the blocks displayed in the game
 - creates initial blocks
 - controls shot hit functionality
-- controls alien hit functionality
+- controls alien hit functionality - clears the squares overlapped by an aliens sprite
 - resets blocks - makes blocks shorter at every level increment
+
+Each block is stored as a mask - one int per row, with bit j set if the square in
+column j is visible. Each block is drawn by a single entity that stamps its visible
+squares, and is only rendered (adding / clearing stamps) when the mask changes.
+
+Every square of every block sits on the same block_size pixel lattice, so a grid index
+maps a lattice cell directly to its block square - a shot lookup is a single dict access.
 """
 
-from turtle import *
+from entities import Entity
 import math
 
 
+class BlockEntity(Entity):
+    """
+    entity drawing a whole block with one (hidden) turtle - a stamp per visible square
+    """
+    def __init__(self, blocks, block_number):
+        super().__init__("square", colour="green",
+                         # define square size relative to default 20 pixels square
+                         stretch_wid=blocks.block_size/20,
+                         stretch_len=blocks.block_size/20,
+                         visible=False)
+        self.blocks = blocks  # parent Blocks
+        self.block_number = block_number
+        self.stamps = {}  # (row, column) -> stamp id of each drawn square
+
+    def render(self):
+        """
+        stamps squares added to the block mask, and clears stamps of squares removed.
+        Return: None - the block turtle itself is never shown
+        """
+        if self.turtle is None:
+            self.turtle = self.create_turtle()
+
+        mask = self.blocks.masks[self.block_number]
+        # clear stamps of squares no longer visible
+        for (i, j), stamp_id in list(self.stamps.items()):
+            if i >= len(mask) or not mask[i] >> j & 1:
+                self.turtle.clearstamp(stamp_id)
+                del self.stamps[(i, j)]
+        # stamp squares not yet drawn
+        for i, row_mask in enumerate(mask):
+            for j in range(self.blocks.brick_columns):
+                if row_mask >> j & 1 and (i, j) not in self.stamps:
+                    self.turtle.goto(self.blocks.square_x(self.block_number, j), self.blocks.square_y(i))
+                    self.stamps[(i, j)] = self.turtle.stamp()
+        return None
+
+
 class Blocks:
     def __init__(self, size, rows, columns):
 
@@ -20,15 +64,17 @@ class Blocks:
         # main screen size (w, h)
         self.screen_size = size
 
-        # create the initial block coordinates (single block)
-        self.initial_block_hit_coordinates = self.create_initial_block_coordinates(self.brick_rows,
-                                                                                   self.brick_columns,
-                                                                                   level=1)
+        # create the initial block mask (single block)
+        self.initial_block_mask = self.create_initial_block_mask(self.brick_rows,
+                                                                 self.brick_columns,
+                                                                 level=1)
 
         self.block_top_y_axis = (-self.screen_size[1]/2)/ 3   # initial block top y-axis
         self.initial_x = (-self.screen_size[0]) / 2   # initial block left x-axis
 
-        self.block_size = 10  # pixels for square shape - default = 20
+        self.block_size = 10  # logical units for square shape - default = 20
+        # collision tolerance - relative to the square size, so it scales with it
+        self.top_tolerance = self.block_size * 0.6  # shots above the top row within this distance can hit it
         # for aligning block placements
         self.block_off_centre = (((self.block_size * self.brick_rows) / 2) + (self.block_size / 2))
 
@@ -36,24 +82,21 @@ class Blocks:
         self.blocks_list = []
         self.get_block_positions()
 
-        # holds each block
-        self.block_coordinates = []
-        for block in self.blocks_list:
-            # creates block with updated coordinates based on the blocks_list position
-            self.block_coordinates.append(self.set_block_hit_positions(block))
+        # holds the mask of each block, and the entity drawing each block
+        self.masks = [list(self.initial_block_mask) for _ in self.blocks_list]
+        self.block_entities = [BlockEntity(self, i) for i in range(len(self.blocks_list))]
 
         # get the block bottom y-axis
-        self.block_bottom_y_axis = self.block_coordinates[0][-1][0][1]
+        self.block_bottom_y_axis = self.square_y(self.brick_rows - 1)
+
+        # maps each lattice cell (cell_x, cell_y) to its block square (block number, row, column)
+        self.grid_index = {}
+        self.build_grid_index()
 
-    def create_initial_block_coordinates(self, rows, columns, level=1):
+    def create_initial_block_mask(self, rows, columns, level=1):
         '''
-        create initial block coordinates starting from (x=0, y=0),
-           decrementing by 10 for each column and for each row.
-        - coordinates are appended to a list, with additional flags,
-            indicating:
-             - [2] = the Turtle object (or None)
-             - [3] = if turtle hit (or None)  (not displayed
-             - [4] = if Turtle should be initially drawn
+        create initial block mask - one int per row, bit j set if the square in column j is drawn.
+        - the bottom middle columns are left clear, growing taller at each level
         '''
 
         # define block column indexes to not draw
@@ -64,24 +107,16 @@ class Blocks:
         # define block rows to apply block column indexes to not draw
         applied_rows = self.brick_rows - level - 1
 
-        initial_coordinates = []
-        y = 0
-        for j in range(0, - rows * 10, -10):  # per row
-            row = []
-            z = 0
-            for i in range(0, columns * 10, 10):  # per column
-                # if meets condition to not draw turtle
-                if z in none_blocks and y >= applied_rows:
-                    # [4] will be False - indicating no turtle to be created
-                    row.append([i, j, None, True, False])
-                else:
-                    row.append([i, j, None, False, True])
-                z += 1
-            initial_coordinates.append(row)
-            y += 1
-
-        return initial_coordinates
+        initial_mask = []
+        for y in range(rows):  # per row
+            row_mask = 0
+            for z in range(columns):  # per column
+                # if meets condition to not draw square
+                if not (z in none_blocks and y >= applied_rows):
+                    row_mask |= 1 << z
+            initial_mask.append(row_mask)
 
+        return initial_mask
 
     def get_block_positions(self, num_blocks=5):
 
@@ -98,148 +133,146 @@ class Blocks:
                 self.blocks_list.append([initial_x, self.block_top_y_axis])
             initial_x += block_gap
 
+    def square_x(self, block_number, j):
+        """
+        returns the x-axis of column j of a block
+        """
+        return self.blocks_list[block_number][0] + j * self.block_size
+
+    def square_y(self, i):
+        """
+        returns the y-axis of row i (all blocks share the same rows)
+        """
+        return self.block_top_y_axis - i * self.block_size
+
+    def block_x_range(self, block_number):
+        """
+        returns the left and right side x-axis of a block
+        """
+        return (self.square_x(block_number, 0) - self.block_size/2,
+                self.square_x(block_number, self.brick_columns - 1) + self.block_size/2)
 
-    def set_block_hit_positions(self, block):
-        """
-        iterates over the initial_block_hit_coordinates and applies the top left x, y coordinate
-        for that block to the coordinates, and adds/creates turtle object at index [2]
-        """
-        x_difference = block[0]  # initial x-axis coordinate for that block
-        y_difference = block[1]  # initial y-axis coordinate for that block
-
-        applied_difference = [[[column[0] + x_difference,  # add the far left-block x-axis
-                                column[1] + y_difference,  # add the top block y-axis
-                                self.draw_block_hit(x=column[0] + x_difference,
-                                                    y=column[1] + y_difference,
-                                                    draw=column[4]),  # create a block square
-                                column[3]] for column in row] for row in self.initial_block_hit_coordinates]
-
-        return applied_difference  # return new block list holding: coordinates, turtle, and hit flag indicator
-
-    def draw_block_hit(self, x, y, draw):
-        """
-        draws the turtle at position x, y, if passed draw variable is true.
-        Return: Turtle, or None if draw=None
-        """
-        if draw:
-            turtle = Turtle()
-            turtle.penup()
-            turtle.shape("square")
-            turtle.color("green")
-            # define square size relative to default 20 pixels square
-            turtle.shapesize(stretch_wid=self.block_size/20, stretch_len=self.block_size/20)
-            turtle.goto(x, y)
-            return turtle
-        else:
-            return None
-
-    def hide_hit_square(self, block, i, j):
-        """
-        clears and hides Turtle, sets hit flag to True
-        """
-        block[i][j][2].hideturtle()
-        block[i][j][2].clear()
-        block[i][j][2] = None
-        block[i][j][3] = True
-
-    def shot_in_range(self, block_number, shot_coordinate, alien=False, moving_right=None):
-        """
-        controls functionality to remove block squares
-        - for spaceship or alien spaceship shots hitting block
-            removes single block
-        - or alien spaceship hitting shit
-        - if alien has hit block - it removes n number of blocks adjacent or above the hit square
-                so game shows all squares the alien img hits are removed
-        block_number: index for block_coordinates
-        shot_coordinate: x, and y position of shot or alien position
-        alien: boolean flag indicating if alien img has hit
-        moving_right: flag indicating the direction the alien is moving
-        """
-
-        def hit_adjacent_squares(block, i, j, moving_right):
-            """
-            iterates over the 4 previous or 4 ahead columns of the relevant block,
-            based on the direction the alien is moving.
-            for each column it iterates over, the inner function hit_above_square is called,
-            which iterates over all the rows above for that column.
-            for each row / each column applicable, that square is removed
-            """
-
-            def hit_above_square(block, i, j):
-                """
-                iterates over all squares above the passed column and initial row and removes the turtle
-                """
-                for num_row in range(i, i - 4, -1):
-                    if num_row < 0:
-                        return  # avoid index error
-                    try:
-                        if not block[num_row][j][3]:  # remove turtle if visible
-                            self.hide_hit_square(block, num_row, j)
-                    except IndexError:
-                        break  # avoid index error
-
-            if moving_right:  # search columns on the left
-                for num_column in range(j+1, j-4, -1):
-                    if num_column < 0:
-                        return  # avoid index error
-                    hit_above_square(block, i, num_column)  # pass to function to search rows above
-            else:  # search columns on the right
-                for num_column in range(j-1, j + 4, 1):
-                    hit_above_square(block, i, num_column)  # pass to function to search rows above
-
-        block = self.block_coordinates[block_number]  # get correct block
-
-        for i, row in enumerate(block):
-            # if shot/alien y-axis within this block rows y-axis
-            if row[0][1] - 7 <= shot_coordinate[1] <= row[0][1] + 7:
-
-                for j, column in enumerate(row):
-                    # find the block square that is hit
-                    if column[0] - 5 <= shot_coordinate[0] <= column[0] + 5:
-
-                        # if hit by a shot (not alien img)
-                        if not alien:
-                            if not column[3]:  # if hit square visible
-                                self.hide_hit_square(block, i, j)  # remove square turtle
-                                return True
-
-                        else:  # hit by an alien
-                            hit_adjacent_squares(block, i, j, moving_right)
-
-        return False
+    def grid_cell(self, x, y):
+        """
+        returns the lattice cell containing the x, y coordinate.
+        Cells are block_size squares centred on each block square, relative to the first block
+        """
+        return (round((x - self.blocks_list[0][0]) / self.block_size),
+                round((self.block_top_y_axis - y) / self.block_size))
+
+    def build_grid_index(self):
+        """
+        maps the lattice cell of every block square to the block number, row and column
+        """
+        self.grid_index = {}
+        for block_number in range(len(self.blocks_list)):
+            for i in range(self.brick_rows):
+                for j in range(self.brick_columns):
+                    cell = self.grid_cell(self.square_x(block_number, j), self.square_y(i))
+                    self.grid_index[cell] = (block_number, i, j)
+
+    def square_visible(self, block_number, i, j):
+        """
+        returns True if the square at row i, column j of a block is visible
+        """
+        return bool(self.masks[block_number][i] >> j & 1)
+
+    def hide_hit_square(self, block_number, i, j):
+        """
+        clears the squares bit from the block mask
+        """
+        self.masks[block_number][i] &= ~(1 << j)
+        self.block_entities[block_number].mark_dirty()
+
+    def shot_hit_square(self, x, y, start_y=None):
+        """
+        removes the first visible block square the shot passes through - swept from start_y
+        (the shots y-axis at the start of the tick) to y, so fast shots can't pass through a square.
+        Without start_y only the lattice cell containing the shot is checked.
+        Return: True if a square was hit
+        """
+        cell_x, end_cell_y = self.grid_cell(x, y)
+        start_cell_y = end_cell_y if start_y is None else self.grid_cell(x, start_y)[1]
+        step = 1 if end_cell_y >= start_cell_y else -1
+
+        # lattice cells along the shots path - in the order the shot passes through them
+        for cell_y in range(start_cell_y, end_cell_y + step, step):
+            square = self.grid_index.get((cell_x, cell_y))
+            if square is not None and self.square_visible(*square):
+                self.hide_hit_square(*square)
+                return True
+        return False  # shot not within any visible square
+
+    def clear_rectangle(self, left, right, bottom, top):
+        """
+        clears every block square overlapping a rectangle (e.g. an aliens sprite bounds) -
+        the overlapped rows and columns are found arithmetically, and each overlapped row
+        cleared with a single column mask. Blocks whose x-range can't overlap are skipped.
+        Return: True if any visible square was cleared
+        """
+        half_square = self.block_size / 2
+
+        # rows overlapping the rectangle - shared by every block
+        first_row = max(math.floor((self.block_top_y_axis - half_square - top) / self.block_size) + 1, 0)
+        last_row = min(math.ceil((self.block_top_y_axis + half_square - bottom) / self.block_size) - 1,
+                       self.brick_rows - 1)
+        if first_row > last_row:
+            return False  # rectangle above or below the blocks
+
+        cleared = False
+        for block_number in range(len(self.masks)):
+            block_left_side, block_right_side = self.block_x_range(block_number)
+            if right <= block_left_side or left >= block_right_side:
+                continue  # rectangle can't overlap this block
+
+            # columns overlapping the rectangle
+            block_x = self.blocks_list[block_number][0]
+            first_column = max(math.floor((left - block_x - half_square) / self.block_size) + 1, 0)
+            last_column = min(math.ceil((right - block_x + half_square) / self.block_size) - 1,
+                              self.brick_columns - 1)
+            clear_mask = ((1 << (last_column - first_column + 1)) - 1) << first_column
+
+            mask = self.masks[block_number]
+            block_cleared = False
+            for i in range(first_row, last_row + 1):
+                if mask[i] & clear_mask:
+                    mask[i] &= ~clear_mask
+                    block_cleared = True
+            if block_cleared:
+                self.block_entities[block_number].mark_dirty()
+                cleared = True
+        return cleared
 
     def reset_bricks(self, level=1, rows=None):
         """
-        resets and redraws the blocks.
-        Redraws the blocks with the new level passed
+        resets the block masks - the block entities only redraw the changed squares.
+        Resets the blocks with the new level passed
+        """
+        self.resize_bricks(level, rows)
+        for block_number in range(len(self.masks)):
+            self.reset_block(block_number)
+
+    def resize_bricks(self, level=1, rows=None):
+        """
+        sets the no. of block rows and the initial block mask for the level passed - the
+        blocks are then reset one at a time by reset_block()
         """
         if level > 1:  # next level
             self.brick_rows -= 1  # decrement brick_rows so blocks are shorter
         if rows:  # directly set the number of rows (end game)
             self.brick_rows = rows
 
-        # recreate initial block coordinates
-        self.initial_block_hit_coordinates = self.create_initial_block_coordinates(self.brick_rows,
-                                                                                   self.brick_columns,
-                                                                                   level=level)
-        # reset blocks list
-        self.blocks_list = None
-        self.blocks_list = []
-        self.get_block_positions()
+        # recreate initial block mask
+        self.initial_block_mask = self.create_initial_block_mask(self.brick_rows,
+                                                                 self.brick_columns,
+                                                                 level=level)
 
-        # hide, clear, and free up resources/memory of old block turtles
-        for block in self.block_coordinates:
-            for row in block:
-                for column in row:
-                    if column[2] is not None:
-                        column[2].hideturtle()
-                        column[2].clear()
-                        column[2] = None
-
-        self.block_coordinates = None
-
-        # recreate blocks
-        self.block_coordinates = []
-        for block in self.blocks_list:
-            self.block_coordinates.append(self.set_block_hit_positions(block))
+        self.block_bottom_y_axis = self.square_y(self.brick_rows - 1)
+        self.build_grid_index()
 
+    def reset_block(self, block_number):
+        """
+        resets a block mask to the initial block mask - after resize_bricks()
+        """
+        self.masks[block_number] = list(self.initial_block_mask)
+        self.block_entities[block_number].mark_dirty()
@@ -0,0 +1,284 @@
+"""
+Pure python game entities - the world state for every sprite in the game
+- each entity owns its position, visibility and shape, independent of turtle
+- game logic and collision checks only read and write entities
+- the turtle layer is a renderer: render_all() syncs each entity to its own Turtle once per frame
+- entities flag themselves dirty when changed - render_all() only visits the dirty entities, and
+  update_screen() only redraws the turtles they changed (screen.update() redraws every turtle)
+- in headless mode no Turtle is ever created, so the game runs without a display
+- entities are positioned in logical units (see resolution.py) - only shapesizes are
+  converted to pixels, by the pixel scale, when the turtle is created
+"""
+
+from turtle import Turtle
+
+headless = False  # flag - when True entities are never drawn
+_dirty = []  # entities changed since the last render
+_changed_turtles = []  # turtles changed by the last render - redrawn by update_screen()
+pixel_scale = 1  # screen pixels per logical unit
+
+
+def set_headless(value=True):
+    """
+    switches headless mode on (or off) - must be called before entities are created
+    """
+    global headless
+    headless = value
+
+
+def set_pixel_scale(scale):
+    """
+    sets the screen pixels per logical unit - must be called before entities are rendered
+    """
+    global pixel_scale
+    pixel_scale = scale
+
+
+def clear_registry():
+    """
+    drops every pending change from the renderer - e.g. between benchmark runs
+    """
+    for entity in _dirty:
+        entity.dirty = False
+    _dirty.clear()
+    _changed_turtles.clear()
+
+
+def render_all():
+    """
+    syncs the entities changed since the last frame to their turtles - call once per frame
+    before update_screen(). Entities removed since the last frame are hidden and dropped.
+    Return: True if any entity changed
+    """
+    global _dirty
+    dirty_entities, _dirty = _dirty, []
+    _changed_turtles.clear()
+    for entity in dirty_entities:
+        entity.dirty = False
+        turtle = entity.render()
+        if turtle:
+            _changed_turtles.append(turtle)
+    return bool(dirty_entities)
+
+
+def update_screen(screen):
+    """
+    redraws only the turtles changed by the last render_all(), then refreshes the screen.
+    screen.update() instead redraws every turtle on the screen - static ones included - so is
+    only needed when turtles are changed outside of the entities (e.g. new info turtles).
+    With no turtles changed only the pending Tk events (key presses, window events) are handled -
+    so call it every frame, to keep the game responsive.
+    """
+    # the turtles are drawn the same way as screen.update() - which needs tracing switched on
+    tracing = screen._tracing
+    screen._tracing = True
+    for turtle in _changed_turtles:
+        turtle._update_data()
+        turtle._drawturtle()
+    screen._tracing = tracing
+    _changed_turtles.clear()
+    screen._update()
+
+
+class Entity:
+    def __init__(self, shape="square", x=0, y=0, colour=None, stretch_wid=None, stretch_len=None, visible=True):
+
+        self.x = x  # x-axis position
+        self.y = y  # y-axis position
+        self.shape_name = shape  # registered turtle shape
+        self.colour = colour
+        self.stretch = (stretch_wid, stretch_len) if stretch_wid else None  # turtle shapesize
+        self.visible = visible
+        self.removed = False  # flag indicating entity is no longer part of the game
+
+        self.turtle = None  # turtle drawing this entity - created on first render
+        self.drawn = None  # (x, y, shape, visible) last pushed to the turtle
+        self.preloaded = False  # flag - create the turtle even while hidden
+        self.dirty = False  # flag indicating entity is waiting to be rendered
+        self.mark_dirty()
+
+    # ------- turtle like accessors - so game logic reads the same as before -------
+    def xcor(self):
+        return self.x
+
+    def ycor(self):
+        return self.y
+
+    def pos(self):
+        return self.xcor(), self.ycor()
+
+    def setx(self, x):
+        self.x = x
+        self.mark_dirty()
+
+    def sety(self, y):
+        self.y = y
+        self.mark_dirty()
+
+    def goto(self, x, y):
+        self.x = x
+        self.y = y
+        self.mark_dirty()
+
+    def shape(self, name=None):
+        """
+        returns the shape name, or sets it if a name is passed
+        """
+        if name is None:
+            return self.shape_name
+        self.shape_name = name
+        self.mark_dirty()
+
+    def hideturtle(self):
+        self.visible = False
+        self.mark_dirty()
+
+    def showturtle(self):
+        self.visible = True
+        self.mark_dirty()
+
+    def isvisible(self):
+        return self.visible
+
+    def remove(self):
+        """
+        hides the entity and flags it for removal from the renderer
+        """
+        self.visible = False
+        self.removed = True
+        self.mark_dirty()
+
+    def preload(self):
+        """
+        creates the turtle of a hidden entity in the next render - so the cost of creating
+        the turtle is paid before the entity is shown (e.g. behind a banner)
+        """
+        self.preloaded = True
+        self.mark_dirty()
+
+    def mark_dirty(self):
+        """
+        queues the entity to be rendered in the next frame
+        """
+        if not self.dirty and not headless:
+            self.dirty = True
+            _dirty.append(self)
+
+    def render(self):
+        """
+        pushes any changed position, shape or visibility to the turtle.
+        The turtle is only created once the entity is first visible, or preloaded.
+        Return: the turtle if changed, else None
+        """
+        state = (self.xcor(), self.ycor(), self.shape(), self.visible and not self.removed)
+        if state == self.drawn:
+            return None  # nothing changed since last frame
+
+        if self.turtle is None:
+            if not state[3] and not self.preloaded:
+                return None  # never drawn and not visible - no turtle needed
+            self.turtle = self.create_turtle()
+
+        turtle = self.turtle
+        x, y, shape, visible = state
+        if not visible:
+            turtle.hideturtle()
+            # a hidden turtle keeps its last drawn position and shape - updated once shown
+            self.drawn = self.drawn[:3] + (False,) if self.drawn else None
+        else:
+            if self.drawn is None or self.drawn[2] != shape:
+                turtle.shape(shape)
+            if self.drawn is None or self.drawn[:2] != (x, y):
+                turtle.goto(x, y)
+            if self.drawn is None or not self.drawn[3]:
+                turtle.showturtle()
+            self.drawn = state
+
+        if self.removed:
+            self.turtle = None  # release the turtle
+        return turtle
+
+    def create_turtle(self):
+        """
+        creates the hidden turtle that draws this entity
+        """
+        # no undo - every goto / stamp would add to the undo buffer, which clearstamp() then searches.
+        # a zero size buffer rather than setundobuffer(None) - stamp() needs a buffer to push to
+        turtle = Turtle(visible=False, undobuffersize=0)
+        turtle.penup()
+        turtle.shape(self.shape())
+        if self.colour:
+            turtle.color(self.colour)
+        if self.stretch:
+            turtle.shapesize(stretch_wid=self.stretch[0] * pixel_scale, stretch_len=self.stretch[1] * pixel_scale)
+        return turtle
+
+
+class PooledEntity(Entity):
+    """
+    entity owned by an EntityPool - removing it returns it to the pool to be reused
+    """
+    def __init__(self, pool, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = pool  # parent EntityPool
+        self.pooled = False  # flag indicating entity is waiting in the pool
+        self.start_y = self.y  # y-axis at the start of the tick - shots are swept from here to y
+
+    def remove(self):
+        """
+        hides the entity and returns it to its pool
+        """
+        self.hideturtle()
+        self.pool.release(self)
+
+
+class EntityPool:
+    """
+    bounded pool of identical entities (e.g. shots) - hidden entities are recycled,
+    along with their turtles, instead of creating a new entity for every shot
+    """
+    def __init__(self, shape="square", colour=None, stretch_wid=None, stretch_len=None, capacity=20):
+        self.shape = shape
+        self.colour = colour
+        self.stretch_wid = stretch_wid
+        self.stretch_len = stretch_len
+        self.capacity = capacity  # max no. of entities kept waiting for reuse
+
+        self.free = []  # hidden entities waiting for reuse
+        self.hits = 0  # acquires served from the pool
+        self.misses = 0  # acquires needing a new entity
+
+    def acquire(self, x, y):
+        """
+        returns a visible entity at position x, y - reused from the pool if available
+        """
+        if self.free:
+            entity = self.free.pop()
+            entity.pooled = False
+            entity.goto(x, y)
+            entity.start_y = y
+            entity.showturtle()
+            self.hits += 1
+            return entity
+
+        self.misses += 1
+        return PooledEntity(self, self.shape, x, y, colour=self.colour,
+                            stretch_wid=self.stretch_wid, stretch_len=self.stretch_len)
+
+    def release(self, entity):
+        """
+        returns a hidden entity to the pool - or removes it if the pool is full
+        """
+        if entity.pooled:
+            return  # already released
+        if len(self.free) < self.capacity:
+            entity.pooled = True
+            self.free.append(entity)
+        else:
+            Entity.remove(entity)
+
+    def stats(self):
+        """
+        returns the pool hits, misses and no. of free entities
+        """
+        return {"hits": self.hits, "misses": self.misses, "free": len(self.free), "capacity": self.capacity}
@@ -0,0 +1,398 @@
+"""
+Game state and per-tick game logic for the space invaders game
+- holds the spaceship, aliens, blocks and the counters previously kept as main.py globals
+- tick() advances the game a single step, without sleeping or touching the screen
+- an optional InfoDisplay is updated when the game is run with a display
+- the game is played in logical units (see resolution.py) - nothing in the game state depends on
+  the screen resolution, so a game replays the same at any resolution
+- all randomness comes from a single random number generator seeded with 'seed', and player
+  input is passed to tick() as flags - so a game replays exactly from its seed and per tick inputs
+  (see replay.py)
+
+Running this file directly plays the game headless (no display) for soak testing:
+    python game.py --ticks 100000
+"""
+
+import argparse
+import hashlib
+import random
+import time
+import entities
+import game_loop_logic
+from profiler import FrameProfiler, NullProfiler
+from main_ship import MainShip
+from blocks_2 import Blocks
+from alien_ships_2 import AlienShips, alien_size
+from resolution import LOGICAL_SIZE
+
+# outcomes returned by tick()
+GAME_OVER = "game_over"
+LEVEL_COMPLETE = "level_complete"
+
+# player input flags passed to tick() - combined with |
+# move flags are set for every tick a move key is held, FIRE on the tick the fire key is pressed
+MOVE_LEFT = 1
+MOVE_RIGHT = 2
+MOVE_LEFT_FAST = 4
+MOVE_RIGHT_FAST = 8
+FIRE = 16
+FAST_MOVE_SCALE = 2.3  # fast moves multiply the spaceship top speed
+
+
+def select_game_icons(all_shapes, *search_string, register=None):
+    """
+    returns a tuple of the GIF files matching each search string - removing matches from all_shapes.
+    register: optional function called with each matched file (e.g. screen.register_shape)
+    """
+    icon_files = []
+    for string in search_string:
+        for shape_file in all_shapes:
+            if string in shape_file:
+                if register:
+                    register(shape_file)
+                icon_files.append(shape_file)
+                all_shapes.pop(all_shapes.index(shape_file))
+    return tuple(icon_files)
+
+
+class SpaceInvadersGame:
+    def __init__(self, size, main_ship_img, alien_imgs, alien_imgs_moving, info=None,
+                 block_rows=9, block_columns=11, alien_rows=5, alien_columns=11, simulation_hz=100,
+                 shot_pool_capacity=20, profiler=None, seed=None,
+                 alien_move_interval=15, shoot_interval=20, level_speed_factor=0.8,
+                 ship_max_speed=3, ship_acceleration=0.5, fire_cooldown=35, max_shots=3, fire_buffer=0):
+
+        self.screen_size = size  # screen dimensions - logical units
+        self.info = info  # InfoDisplay - None when headless
+        self.profiler = profiler or NullProfiler()  # times each phase of a tick
+        self.block_rows = block_rows
+
+        # random number generator - a random seed is chosen if not passed, so every game can be replayed
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+
+        # game components
+        self.space_ship = MainShip(main_ship_img, size, shot_pool_capacity=shot_pool_capacity,
+                                   max_speed=ship_max_speed, acceleration=ship_acceleration,
+                                   fire_cooldown=fire_cooldown, max_shots=max_shots, fire_buffer=fire_buffer)
+        self.blocks = Blocks(size, rows=block_rows, columns=block_columns)
+        self.aliens = AlienShips(size, alien_imgs, alien_imgs_moving, rows=alien_rows, columns=alien_columns,
+                                 shot_pool_capacity=shot_pool_capacity, rng=self.rng)
+
+        # top boundary line y-axis - spaceship shots removed when passed
+        self.boundary_line_y = size[1]/2 - (size[1]/2) / 10
+
+        self.level = 1  # user level
+        self.score = 0  # no. of aliens hit
+
+        # balancing - starting ticks between alien moves and alien shots, and the tick period
+        # multiplier applied at every level
+        self.base_alien_move_speed = alien_move_interval
+        self.base_shoot_interval = shoot_interval
+        self.level_speed_factor = level_speed_factor
+
+        # counters and intervals controlling when aliens move and when aliens shoot
+        self.move_counter = 0
+        self.shoot_counter = 0
+        self.alien_ship_move_speed = self.base_alien_move_speed
+        self.initial_shoot_interval = self.base_shoot_interval
+        self.alien_shoot_interval = self.rng.randint(self.initial_shoot_interval, self.initial_shoot_interval * 2)
+
+        # game speed - seconds of game time per tick, reduced at every level
+        self.base_speed = 1 / simulation_hz
+        self.speed = self.base_speed
+        self.original_speed = self.speed
+
+    def tick(self, inputs=0):
+        """
+        advances the game by one step - applies the player inputs, moves aliens and shots
+        and resolves all collisions.
+        inputs: player input flags (MOVE_LEFT, MOVE_RIGHT, MOVE_LEFT_FAST, MOVE_RIGHT_FAST, FIRE)
+        Return: GAME_OVER, LEVEL_COMPLETE, or None if the game continues
+        """
+        profile = self.profiler.phase
+
+        self.apply_inputs(inputs)  # every tick - the spaceship slows down with no move flags
+
+        # increments the counters
+        self.move_counter += 1
+        self.shoot_counter += 1
+
+        # if counter greater than alien shoot interval - fire a random alien shot
+        if self.shoot_counter > self.alien_shoot_interval:
+            with profile("alien_shot"):
+                self.aliens.random_shot()
+            self.shoot_counter = 0  # reset counter for shoot interval
+
+        # if counter greater than alien_ship_move_speed - move aliens
+        if self.move_counter > self.alien_ship_move_speed:
+            with profile("alien_march"):
+                hit_wall = self.aliens.move()
+            # check if aliens passed user - end game
+            with profile("check_alien_passed_finish"):
+                if game_loop_logic.check_alien_passed_finish(self.aliens, self.space_ship):
+                    return GAME_OVER
+            # check if alien hit blocks
+            with profile("check_alien_hit_block"):
+                game_loop_logic.check_alien_hit_block(self.aliens, self.blocks)
+            # switch each aliens img
+            with profile("alien_march"):
+                self.aliens.switch_ships()
+
+            # if aliens moved and hit wall - alien speed increases
+            if hit_wall:
+                if self.alien_ship_move_speed > 1:
+                    self.alien_ship_move_speed -= 1
+            self.move_counter = 0  # reset counter for move speed
+
+        # moves spaceship shots and checks if hit block or alien
+        if self.space_ship.shots_fired:
+            shots = self.space_ship.shots_fired
+            removed = set()  # shots hit or passed the line this tick - removed once all checks are done
+            with profile("shot_movement"):
+                self.space_ship.shot_move_up()  # move shots
+            with profile("check_shot_hit_block"):
+                game_loop_logic.check_shot_hit_block(shots, self.blocks, removed)  # hit block
+            with profile("check_passed_line"):
+                game_loop_logic.check_passed_line(shots, self.boundary_line_y, spaceship=True, removed=removed)
+            with profile("check_shot_hit_alien"):
+                aliens_hit = game_loop_logic.check_shot_hit_alien(shots, self.aliens, self.space_ship,
+                                                                  removed)  # hit alien interaction
+            with profile("remove_shots"):
+                game_loop_logic.remove_shots(shots, removed)
+            self.score += aliens_hit  # increment score for each alien hit
+            if self.info:
+                for _ in range(aliens_hit):
+                    self.info.create_score(updated_score=True)
+
+        # moves alien spaceship shots and checks if hit block or user spaceship
+        if self.aliens.shots_fired:
+            shots = self.aliens.shots_fired
+            removed = set()  # shots hit or passed the line this tick - removed once all checks are done
+            with profile("shot_movement"):
+                self.aliens.move_shots()  # move shots
+            with profile("check_shot_hit_block"):
+                game_loop_logic.check_shot_hit_block(shots, self.blocks, removed)  # hit block
+            with profile("check_passed_line"):
+                game_loop_logic.check_passed_line(shots, self.space_ship.boundary_line_y, removed=removed)
+            with profile("check_shot_hit_space_ship"):
+                more_lives = game_loop_logic.check_shot_hit_space_ship(shots, self.space_ship,
+                                                                       removed)  # hit spaceship
+            with profile("remove_shots"):
+                game_loop_logic.remove_shots(shots, removed)
+            if not more_lives:  # if hit spaceship and no more user lives
+                return GAME_OVER
+
+        # Increase speed significantly of the last alien ship
+        if self.aliens.last_ship:
+            if self.speed == self.original_speed:
+                self.alien_ship_move_speed = 0
+
+        # next level if all alien ships shot
+        if self.aliens.no_more_ships:
+            return LEVEL_COMPLETE
+        return None
+
+    def apply_inputs(self, inputs):
+        """
+        moves the spaceship (held move flags accelerate it, otherwise it slows down)
+        and fires a shot if flagged in inputs and allowed by the spaceship fire control
+        """
+        direction = 0
+        if inputs & (MOVE_LEFT | MOVE_LEFT_FAST):
+            direction -= 1
+        if inputs & (MOVE_RIGHT | MOVE_RIGHT_FAST):
+            direction += 1
+        fast = inputs & (MOVE_LEFT_FAST | MOVE_RIGHT_FAST)
+        self.space_ship.move(direction, FAST_MOVE_SCALE if fast else 1)
+
+        self.space_ship.fire(bool(inputs & FIRE))  # every tick - counts down the cooldown
+
+    def state_hash(self):
+        """
+        returns a hash of the game state - equal for a game replayed from the same seed and inputs
+        """
+        state = (self.level, self.score, self.space_ship.lives, self.speed,
+                 self.move_counter, self.shoot_counter, self.alien_ship_move_speed, self.alien_shoot_interval,
+                 self.space_ship.main_ship.pos(), self.space_ship.velocity,
+                 self.space_ship.cooldown, self.space_ship.buffered_fire,
+                 self.aliens.origin_x, self.aliens.origin_y, self.aliens.moving_right, self.aliens.alive,
+                 self.blocks.masks,
+                 [shot.pos() for shot in self.space_ship.shots_fired],
+                 [shot.pos() for shot in self.aliens.shots_fired])
+        return hashlib.sha1(repr(state).encode()).hexdigest()
+
+    def end_game(self):
+        """
+        user ran out of lives or aliens passed user - hides aliens and all shots
+        """
+        self.aliens.switch_ships(switch=False)  # hide current aliens
+        if self.info:
+            self.info.end_game(self.level)  # display end game text
+        self.space_ship.remove_all_shots()  # remove spaceship shots
+        self.aliens.remove_all_shots()  # remove alien shots
+
+    def new_game_reset(self):
+        """
+        resets the game to base level - after end_game()
+        """
+        for _ in self.new_game_steps():
+            pass
+
+    def new_game_steps(self):
+        """
+        resets the game to base level - after end_game() - a step at a time.
+        A generator yielding the fraction rebuilt after each step (see rebuild_steps()) - the
+        game restarts (and the end game text is removed) on the step after it yields 1
+        """
+        yield from self.rebuild_steps(rows=self.block_rows)  # reset alien and block positions
+
+        if self.info:
+            self.info.reset_info_text()  # reset all info turtle text for next game
+        self.aliens.show_all_aliens()
+        self.level = 1
+        self.score = 0
+        self.space_ship.reset_main_ship(end_game=True)  # reset main spaceship
+
+        # reset counters and intervals to base values
+        self.move_counter = 0
+        self.shoot_counter = 0
+        self.alien_ship_move_speed = self.base_alien_move_speed
+        self.speed = self.base_speed
+        self.original_speed = self.speed
+        self.initial_shoot_interval = self.base_shoot_interval
+        self.alien_shoot_interval = self.rng.randint(self.initial_shoot_interval, self.initial_shoot_interval * 2)
+
+    def build_steps(self):
+        """
+        recreates the aliens and blocks of the new game a step at a time - e.g. behind a loading page,
+        so their turtles aren't all created in the first frame. A generator yielding the fraction
+        built after each step (see rebuild_steps()) - the aliens are shown after the last step
+        """
+        yield from self.rebuild_steps(rows=self.block_rows)
+        self.aliens.show_all_aliens()
+
+    def rebuild_steps(self, level=1, rows=None):
+        """
+        places the aliens in their starting position (hidden) and resets the blocks - a generator
+        yielding the fraction rebuilt after each alien row and each block, so a display can
+        spread the turtle creation and block stamping over several frames
+        """
+        self.aliens.clear_alien_ships()
+        self.blocks.resize_bricks(level, rows)
+
+        steps = self.aliens.rows + len(self.blocks.masks)
+        for i in range(self.aliens.rows):
+            self.aliens.create_alien_row(i, visible=False)  # turtles created hidden
+            yield (i + 1) / steps
+        for block_number in range(len(self.blocks.masks)):
+            self.blocks.reset_block(block_number)
+            yield (self.aliens.rows + block_number + 1) / steps
+
+    def end_level(self):
+        """
+        all alien ships shot - hides aliens and alien shots, increments the level
+        """
+        self.aliens.switch_ships(switch=False)  # hide current aliens
+        self.level += 1  # increment level counter
+        if self.info:
+            self.info.next_game(self.level)  # should be new level
+            self.info.create_level(updated_level=True)  # show next level info
+        self.aliens.remove_all_shots()  # remove all alien shots
+
+    def next_level(self):
+        """
+        sets up the next game level - after end_level()
+        """
+        for _ in self.next_level_steps():
+            pass
+
+    def next_level_steps(self):
+        """
+        sets up the next game level - after end_level() - a step at a time.
+        A generator yielding the fraction rebuilt after each step (see rebuild_steps()) - the
+        level starts (and the next level text is removed) on the step after it yields 1
+        - increase alien speed
+        - reduce size of blocks
+        - increase alien shoot interval
+        """
+        # reset alien and block positions - level passed to reduce block size
+        yield from self.rebuild_steps(level=self.level)
+
+        if self.info:
+            self.info.remove_next_level_text()  # reset info turtle text
+        self.aliens.show_all_aliens()
+        self.space_ship.reset_main_ship()  # reset main spaceship
+        self.space_ship.remove_all_shots()  # remove all spaceship shots
+
+        # Assign counters and intervals to base values or new (next level) values
+        self.move_counter = 0
+        self.shoot_counter = 0
+        self.alien_ship_move_speed = self.base_alien_move_speed
+        self.initial_shoot_interval = max(self.initial_shoot_interval - 2, 1)  # decrease time for aliens to shoot
+        self.alien_shoot_interval = self.rng.randint(self.initial_shoot_interval, self.initial_shoot_interval * 2)
+
+        self.speed *= self.level_speed_factor  # increase game speed
+        self.original_speed = self.speed
+
+
+def load_game_icons(size=LOGICAL_SIZE, scale=1, alien_rows=5, alien_columns=11):
+    """
+    returns the main ship, alien and moving alien GIF files - without registering turtle shapes.
+    The GIF images are created in ./game_icons, at scale pixels per logical unit, if not already present.
+    The alien images are sized to fit an alien_rows x alien_columns formation
+    """
+    from shapes import MakeShapes
+
+    all_shapes = MakeShapes(size, scale, alien_size=alien_size(size, alien_rows, alien_columns)).get_images()
+    main_ship = select_game_icons(all_shapes, "main_ship")
+    aliens_moving = select_game_icons(all_shapes, "top_ship_moving", "second_ship_moving", "third_ship_moving")
+    aliens = select_game_icons(all_shapes, "top_ship", "second_ship", "third_ship")
+    return main_ship[0], aliens, aliens_moving
+
+
+def make_headless_game(size=LOGICAL_SIZE, **kwargs):
+    """
+    creates a game with no display - kwargs are passed to SpaceInvadersGame
+    """
+    entities.set_headless()
+    main_ship, aliens, aliens_moving = load_game_icons(size, alien_rows=kwargs.get("alien_rows", 5),
+                                                       alien_columns=kwargs.get("alien_columns", 11))
+    return SpaceInvadersGame(size, main_ship, aliens, aliens_moving, **kwargs)
+
+
+def run_headless(game, ticks, inputs=None):
+    """
+    runs the game for n ticks at full speed - playing on through game over and new levels.
+    inputs: optional player input flags for each tick (e.g. from a recording)
+    Return: ticks per second
+    """
+    start = time.perf_counter()
+    for tick in range(ticks):
+        outcome = game.tick(inputs[tick] if inputs else 0)
+        game.profiler.end_frame()  # each tick is a frame when headless
+        if outcome == GAME_OVER:
+            game.end_game()
+            game.new_game_reset()
+        elif outcome == LEVEL_COMPLETE:
+            game.end_level()
+            game.next_level()
+    return ticks / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run space invaders headless (no display)")
+    parser.add_argument("--ticks", type=int, default=10000, help="number of game ticks to run")
+    parser.add_argument("--trace", help="file to write a Chrome trace of the last 300 ticks to")
+    parser.add_argument("--seed", type=int, help="random seed (default random)")
+    args = parser.parse_args()
+
+    profiler = FrameProfiler() if args.trace else None
+    game = make_headless_game(profiler=profiler, seed=args.seed)
+    ticks_per_second = run_headless(game, args.ticks)
+    print(f"{args.ticks} ticks - {ticks_per_second:.0f} ticks/s (seed {game.seed})")
+    print(f"spaceship shot pool: {game.space_ship.shot_pool.stats()}")
+    print(f"alien shot pool: {game.aliens.shot_pool.stats()}")
+    if profiler:
+        print(profiler.summary())
+        profiler.dump(args.trace)
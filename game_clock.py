@@ -0,0 +1,112 @@
+"""
+Fixed timestep clock for the main game loop
+- the game advances in fixed ticks of game time, independent of how long rendering takes
+- rendering runs at its own rate (render_hz), decoupled from the simulation rate
+- when the game falls behind, at most max_ticks_per_frame ticks are run before the
+  next frame - the remaining time is dropped so slow frames don't compound
+- measures the time spent per tick and per frame against the tick budget - summary() is
+  shown on the profile overlay
+"""
+
+import time
+
+# weighting of the latest measurement in the moving average timings
+SMOOTHING = 0.1
+
+
+class FixedTimestep:
+    def __init__(self, render_hz=60, max_ticks_per_frame=5):
+
+        self.render_period = 1 / render_hz  # seconds between frames
+        self.max_ticks_per_frame = max_ticks_per_frame
+
+        self.accumulator = 0  # game time owed to the simulation (seconds)
+        self.last_time = time.perf_counter()
+        self.next_render = self.last_time
+
+        # measured timings - moving averages (seconds)
+        self.tick_time = 0
+        self.render_time = 0
+
+        # counters
+        self.ticks = 0
+        self.frames = 0
+        self.dropped_ticks = 0  # ticks skipped when the game fell behind
+
+    def reset(self):
+        """
+        restarts the clock - time spent outside the loop (e.g. level banners) is not owed to the game
+        """
+        self.accumulator = 0
+        self.last_time = time.perf_counter()
+        self.next_render = self.last_time
+
+    def ticks_due(self, tick_period):
+        """
+        returns the number of ticks to run now to keep the game in step with real time.
+        tick_period: seconds of game time per tick
+        """
+        now = time.perf_counter()
+        self.accumulator += now - self.last_time
+        self.last_time = now
+
+        due = int(self.accumulator // tick_period)
+        self.accumulator -= due * tick_period
+        if due > self.max_ticks_per_frame:  # fallen behind - drop the excess ticks
+            self.dropped_ticks += due - self.max_ticks_per_frame
+            due = self.max_ticks_per_frame
+        return due
+
+    def render_due(self):
+        """
+        returns True if a frame should be drawn now
+        """
+        now = time.perf_counter()
+        if now < self.next_render:
+            return False
+        # schedule next frame - from now if more than a frame behind
+        self.next_render = max(self.next_render + self.render_period, now)
+        return True
+
+    def record_tick(self, start):
+        """
+        records the duration of a tick started at perf_counter() time 'start'
+        """
+        self.tick_time += (time.perf_counter() - start - self.tick_time) * SMOOTHING
+        self.ticks += 1
+
+    def record_render(self, start):
+        """
+        records the duration of a frame started at perf_counter() time 'start'
+        """
+        self.render_time += (time.perf_counter() - start - self.render_time) * SMOOTHING
+        self.frames += 1
+
+    def tick_budget(self, tick_period):
+        """
+        returns the fraction of real time needed to keep up at this tick period -
+        ticks plus their share of rendering. Above 1.0 the game cannot keep up.
+        """
+        return (self.tick_time + self.render_time * tick_period / self.render_period) / tick_period
+
+    def summary(self, tick_period):
+        """
+        returns a text summary of the tick budget and dropped ticks - for the on-screen profile overlay
+        """
+        return (f"tick budget: {self.tick_budget(tick_period) * 100:.0f}% "
+                f"(tick {self.tick_time * 1000:.3f} ms, frame {self.render_time * 1000:.3f} ms)\n"
+                f"dropped ticks: {self.dropped_ticks}")
+
+    def wait(self, tick_period=None):
+        """
+        sleeps until the next tick or frame is due.
+        tick_period: None when no ticks are being run (e.g. the game is paused) - waits for the next frame
+        """
+        now = time.perf_counter()
+        next_wake = self.next_render
+        if tick_period is not None:
+            next_tick = now + tick_period - self.accumulator - (now - self.last_time)
+            next_wake = min(next_tick, next_wake)
+        delay = next_wake - now
+        if delay > 0:
+            time.sleep(delay)
@@ -1,6 +1,16 @@
 """
 Module helping the interactions between classes for game functionality
 - helps avoid cluttering in main game loop logic
+
+Shot collision checks never remove shots from the list they are iterating. Each shot that hits
+something (or leaves the screen) is queued in a 'removed' set - later checks in the same tick
+skip queued shots, and remove_shots() then removes the queued shots in a single pass.
+Each check tests every remaining shot exactly once. If no 'removed' set is passed a check
+resolves its own removals before returning.
+
+Shot checks are swept - each shot is tested along its whole path this tick, from its start_y
+to its current y-axis, so raising the shot speed (or lowering the tick rate) can't make
+shots pass through block squares, aliens or the spaceship.
 """
 import operator
 
@@ -8,146 +18,167 @@ operator_dict = {
     ">": operator.gt,
     "<": operator.lt}
 
-def check_shot_hit_block(shot_list, blocks):
+
+def remove_shots(shot_list, removed):
     """
-    checks if an alien or spaceship shot will hit a block in the game
-    - if the shots y-axis and x-axis are withing the blocks then the block and the
-      shots coordinates are passed to block class to remove the hot block
+    resolves the queued shot removals - removes each queued shots entity, and compacts the
+    shot list in place in a single pass (the remaining shots keep their order)
     """
-    for shot in shot_list:
-        # if within the y axis range of blocks
-        if blocks.block_bottom_y_axis <= shot.ycor() <= blocks.block_top_y_axis + 6:
-            # iterate over each block
-            for i, single_block in enumerate(blocks.block_coordinates):
-                # if shot within the block x-axis
-                if (single_block[0][0][0] - blocks.block_size/2  # left block square x-ax - square pixel offset
-                        <= shot.xcor() <=
-                        single_block[0][-1][0] + blocks.block_size/2):  # right block square x-ax - square pixel offset
-                    # pass to block class to remove block square
-                    block_hit = blocks.shot_in_range(i, shot.pos())
-
-                    if block_hit:  # remove the shot if hit the block
-                        shot.hideturtle()
-                        shot.clear()
-                        shot_list.pop(shot_list.index(shot))
-
-
-def check_alien_hit_block(aliens, blocks):
+    if not removed:
+        return
+    remaining_shots = []
+    for shot in shot_list:  # in list order - so the shot pool reuses entities in a repeatable order
+        if shot in removed:
+            shot.remove()
+        else:
+            remaining_shots.append(shot)
+    shot_list[:] = remaining_shots
+
+
+def check_shot_hit_block(shot_list, blocks, removed=None):
     """
-    checks if an alien spaceship has hit a block
-    - if an alien spaceship y-axis and x-axis are withing the blocks then the
-      alien coordinates and block number are passed to block class to remove relevant block squares
+    checks if an alien or spaceship shot will hit a block in the game
+    - the shots coordinates are looked up in the blocks grid index, which removes
+      the block square in the shots lattice cell
+    - shots hitting a block are queued in removed
     """
-    # size of alien img y-axis offset from centre of turtle
-    alien_y_axis_offset = ((aliens.alien_img_dims[0][1]) / 2) - 1
+    resolve = removed is None  # resolve the removals here if not passed a queue
+    if resolve:
+        removed = set()
 
-    # get the lowest alien y-axis
-    lowest_alien_y = aliens.get_lowest_y_axis() - alien_y_axis_offset
+    for shot in shot_list:
+        if shot in removed:
+            continue  # already hit this tick
+        # if the shots path this tick is within the y axis range of blocks
+        if (min(shot.start_y, shot.ycor()) <= blocks.block_top_y_axis + blocks.top_tolerance
+                and max(shot.start_y, shot.ycor()) >= blocks.block_bottom_y_axis - blocks.block_size/2):
+            # pass to block class to remove the first block square on the shots path
+            block_hit = blocks.shot_hit_square(shot.xcor(), shot.ycor(), start_y=shot.start_y)
 
-    # checks if lowest alien y-axis within the y axis range of the blocks
-    if blocks.block_top_y_axis + 10 >= lowest_alien_y >= blocks.block_bottom_y_axis - 10:
+            if block_hit:  # remove the shot if hit the block
+                removed.add(shot)
 
-        # get the list of lowest aliens spaceships per row - subset of all alien spaceships
-        alien_list = aliens.get_lowest_visible_aliens()
+    if resolve:
+        remove_shots(shot_list, removed)
 
-        # size of alien img x-axis offset from centre of turtle
-        alien_x_axis_offset = - (aliens.alien_img_dims[0][0] / 2) - 5
-        if aliens.moving_right:
-            alien_x_axis_offset = abs(alien_x_axis_offset)
 
-        # for each alien in the bottom alien row list
-        for single_alien in alien_list:
+def check_alien_hit_block(aliens, blocks):
+    """
+    checks if alien spaceships have hit a block
+    - every alive alien in a row reaching the blocks has the squares overlapped by its
+      img bounds cleared by the block class
+    """
+    # size of alien img offsets from centre of turtle
+    alien_x_axis_offset = aliens.alien_img_dims[0][0] / 2
+    alien_y_axis_offset = aliens.alien_img_dims[0][1] / 2
 
-            # if alien within the block y-axis
-            if blocks.block_top_y_axis + 10 >= single_alien.ycor() - alien_y_axis_offset >= blocks.block_bottom_y_axis - 10:
+    # y-axis of the top of the blocks
+    block_top = blocks.block_top_y_axis + blocks.block_size / 2
 
-                # for each block
-                for i, single_block in enumerate(blocks.block_coordinates):
-                    # define the left and right block boundary
-                    block_left_side = single_block[0][0][0] - blocks.block_size/2
-                    block_right_side = single_block[0][-1][0] + blocks.block_size/2
+    # from the lowest row up - until a row is above the blocks
+    for i in range(aliens.bottom_row, aliens.top_row - 1, -1):
+        alien_y = aliens.alien_y(i)
+        if alien_y - alien_y_axis_offset >= block_top:
+            break
+        if not aliens.row_counts[i]:
+            continue
 
-                    # if alien within the x-axis of the block
-                    if block_left_side <= single_alien.xcor() + alien_x_axis_offset <= block_right_side:
-                        # pass to block class to remove relevant block squares
-                        block_hit = blocks.shot_in_range(i,
-                                                         (single_alien.xcor() + alien_x_axis_offset,
-                                                          single_alien.ycor() - alien_y_axis_offset),
-                                                         alien=True,
-                                                         moving_right=aliens.moving_right)
+        for j in range(aliens.left_column, aliens.right_column + 1):
+            if aliens.alive[i][j]:
+                alien_x = aliens.alien_x(j)
+                blocks.clear_rectangle(alien_x - alien_x_axis_offset, alien_x + alien_x_axis_offset,
+                                       alien_y - alien_y_axis_offset, alien_y + alien_y_axis_offset)
 
 
-def check_passed_line(shot_list, ref_object, spaceship=False):
+def check_passed_line(shot_list, boundary_line_y, spaceship=False, removed=None):
     """
-    removes alien shots if passed a boundary line
+    removes alien or spaceship shots if passed a boundary line y-axis
+    - shots passed the line are queued in removed
     """
+    resolve = removed is None  # resolve the removals here if not passed a queue
+    if resolve:
+        removed = set()
+
     # diff. comparison operator dependant on if spaceship or alien shot
-    greater_lesser = ">" if spaceship else "<"
+    passed = operator_dict[">" if spaceship else "<"]
     for shot in shot_list:
-        # if shit passed y-axis of screen boundary
-        if operator_dict[greater_lesser](shot.ycor(), ref_object.boundary_line_y):
-            # remove the shot turtle
-            shot.hideturtle()
-            shot.clear()
-            shot_list.pop(shot_list.index(shot))
-            del shot
+        # if shot passed y-axis of screen boundary
+        if shot not in removed and passed(shot.ycor(), boundary_line_y):
+            removed.add(shot)
+
+    if resolve:
+        remove_shots(shot_list, removed)
 
 
-def check_shot_hit_space_ship(shot_list, space_ship):
+def check_shot_hit_space_ship(shot_list, space_ship, removed=None):
     """
     checks if alien shot will hit the user space ship
     - calls space_ship class for shot hit functionality
+    - shots hitting the spaceship are queued in removed
     return: Boolean - if user has more lives left
     """
+    resolve = removed is None  # resolve the removals here if not passed a queue
+    if resolve:
+        removed = set()
+
+    more_lives = True
     for shot in shot_list:
-        # if shot within the y-axis range of spaceship
-        if space_ship.main_ship_bottom <= shot.ycor() <= space_ship.main_ship_top:
+        if shot in removed:
+            continue  # already hit this tick
+        # if the shots path this tick (moving down) crosses the y-axis range of spaceship
+        if shot.ycor() <= space_ship.main_ship_top and shot.start_y >= space_ship.main_ship_bottom:
             # if shot within the x-axis range of spaceship
             if (space_ship.main_ship.xcor() - space_ship.main_ship_off_centre
                     <= shot.xcor() <=
                     space_ship.main_ship.xcor() + space_ship.main_ship_off_centre):
                 # pass to space_ship class - returns indicator of more lives
                 more_lives = space_ship.shot_in_range()
-                if more_lives:
-                    # remove shot
-                    shot.hideturtle()
-                    shot.clear()
-                    shot_list.pop(shot_list.index(shot))
-                    del shot
-                    return True
-                else:
-                    return False
-    return True
-
-
-def check_shot_hit_alien(shot_list, aliens, space_ship):
+                if not more_lives:
+                    break  # game over
+                removed.add(shot)
+
+    if resolve:
+        remove_shots(shot_list, removed)
+    return more_lives
+
+
+def check_shot_hit_alien(shot_list, aliens, space_ship, removed=None):
     """
     checks if spaceship shot will hit an alien spaceship
     - if the shots y-axis are withing the aliens -
       pass the shot coordinates to alien_ships class for hit functionality
-    Return: True if hit alien, False if not hit alien
+    - shots hitting an alien are queued in removed
+    Return: the number of aliens hit (0 if not hit alien)
     """
+    resolve = removed is None  # resolve the removals here if not passed a queue
+    if resolve:
+        removed = set()
+
     # get top and bottom y-axis for remaining alien spaceships
     top_alien_y = aliens.get_highest_y_axis()
     bottom_alien_y = aliens.get_lowest_y_axis() - (aliens.alien_img_dims[0][1] / 2)  # subtract img x-axis offset
 
     shot_y_axis_offset = (space_ship.shot_width * 20)/2  # pixel offset from shot turtle centre
 
+    aliens_hit = 0
     for shot in shot_list:
-        # if shot within the visible alien y-axis range
-        if top_alien_y >= shot.ycor() + shot_y_axis_offset >= bottom_alien_y:
+        if shot in removed:
+            continue  # already hit this tick
+        # if the shots path this tick (moving up) crosses the visible alien y-axis range
+        if (shot.start_y + shot_y_axis_offset <= top_alien_y
+                and shot.ycor() + shot_y_axis_offset >= bottom_alien_y):
 
             # passes to alien_ships for hit functionality
             hit = aliens.check_shot_in_range(shot.ycor() + shot_y_axis_offset,
-                                             shot.xcor())
-            if hit: # if hit alien - remove shot
-                shot.hideturtle()
-                shot.clear()
-                shot_list.pop(shot_list.index(shot))
-                shot = None
-                del shot
-                return True
-    return False
+                                             shot.xcor(),
+                                             start_y=shot.start_y + shot_y_axis_offset)
+            if hit:  # if hit alien - remove shot
+                removed.add(shot)
+                aliens_hit += 1
+
+    if resolve:
+        remove_shots(shot_list, removed)
+    return aliens_hit
 
 
 def check_alien_passed_finish(aliens, main_ship):
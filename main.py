@@ -5,205 +5,244 @@ Main file for running the space invaders game
 from turtle import *
 from shapes import MakeShapes
 from Info_page import InfoDisplay
-from main_ship import MainShip
-from blocks_2 import Blocks
-from alien_ships_2 import AlienShips
+from game import (SpaceInvadersGame, select_game_icons, GAME_OVER, LEVEL_COMPLETE,
+                  MOVE_LEFT, MOVE_RIGHT, MOVE_LEFT_FAST, MOVE_RIGHT_FAST, FIRE)
+from replay import InputRecorder
+from game_clock import FixedTimestep
+from profiler import FrameProfiler
+from resolution import Resolution, LOGICAL_SIZE
+from background import Starfield, StaticLayer
+from alien_ships_2 import alien_size
+import entities
 import time
-import game_loop_logic
-import random
+import atexit
 from highscores import HighScore
 
 
-# Function to draw stars as small dots
-def draw_bg_stars(num_stars):
-    star_turtle = Turtle()
-    star_turtle.penup()
-    star_turtle.hideturtle()
-    star_turtle.speed("fastest")  # Maximize drawing speed
-    for _ in range(num_stars):
-        # Random position
-        x = random.randint(int(round(-size[0]/2)), int(round(size[0]/2)))
-        y = random.randint(int(round(-size[1]/2)), int(round(size[1]/2)))
-        star_turtle.goto(x, y)
-        # Random color
-        star_turtle.dot(random.randint(2, 6), random.choice(["white", "light yellow", "light blue"]))
-
-
-def select_game_icons(*search_string):
-    icon_files = []
-    for string in search_string:
-        for shape_file in all_shapes:
-            if string in shape_file:
-                screen.register_shape(shape_file)
-                icon_files.append(shape_file)
-                all_shapes.pop(all_shapes.index(shape_file))
-    return tuple(icon_files)
-
-
-def loading_page():
-    loading_page = True
-    k = 0
-    while loading_page:
-        if k == 0:
-            info.write_loading_text()
-        info.create_progress_bar()
-        if k == 15:
-            info.remove_loading_page()
-            loading_page = False
-        k += 1
-        screen.update()
-        time.sleep(0.2)
-
-
-size = 1000, 800  # default screen size
-
-# make space invaders components
-shapes = MakeShapes(size)
-# get gif file names for all space invader game components
-all_shapes = shapes.get_images()
+def bake_static_layers(frames):
+    """
+    draws the boundary lines over each background frame, and hides the boundary line turtles.
+    Return: the GIF file of each baked frame
+    """
+    baked_frames = []
+    for frame in frames:
+        layer = StaticLayer(resolution, base_file=frame)
+        # top barrier and bottom boundary line - the width of the screen
+        layer.add_line(info.boundary_line_y, size[0], 4, "green")
+        layer.add_line(space_ship.boundary_line_y, size[0], 4, "green")
+        baked_frames.append(layer.save(frame.replace("starfield", "static_layer")))
+    info.top_barrier_line.hideturtle()
+    space_ship.boundary_line.hideturtle()
+    return baked_frames
+
+
+def loading_page(steps):
+    """
+    shows the loading page while the game loads - the progress bar and screen are updated after
+    every step, so the page is only shown for as long as the loading work takes.
+    steps: generator yielding the fraction loaded after each chunk of work (see load_game())
+    """
+    info.write_loading_text()
+    for progress in steps:
+        info.update_progress_bar(progress)
+        entities.render_all()  # draw the entities created by the step
+        entities.update_screen(screen)
+    info.remove_loading_page()
+
+
+def load_game():
+    """
+    loads the game a chunk of work at a time - a generator yielding the fraction loaded after each chunk
+    - renders (or reuses the cached) starfield background
+    - makes or checks the cache of each sprite image, and registers the turtle shapes
+    - creates the game, then builds its aliens and blocks a row / block at a time
+    """
+    global background_frames, game, space_ship
+
+    # background stars - a pre-rendered starfield image
+    background_frames = Starfield(resolution, 200, seed=STAR_SEED, frames=TWINKLE_FRAMES).get_frames()
+    screen.bgpic(background_frames[0])
+    yield 0.1
+
+    # get gif file names for all space invader game components
+    all_shapes = []
+    for shape_file in shapes.iter_images():
+        all_shapes.append(shape_file)
+        yield 0.1 + 0.4 * len(all_shapes) / len(shapes.shapes)
+
+    main_ship = select_game_icons(all_shapes, "main_ship",
+                                  register=screen.register_shape)  # select main ship gif file
+    aliens_moving = select_game_icons(all_shapes,  # select aliens ship moving gif file
+                                      "top_ship_moving",
+                                      "second_ship_moving",
+                                      "third_ship_moving",
+                                      register=screen.register_shape)
+    aliens = select_game_icons(all_shapes,  # select aliens ship gif file
+                               "top_ship",
+                               "second_ship",
+                               "third_ship",
+                               register=screen.register_shape)
+    yield 0.55
+
+    # create the game - main spaceship, block shields and alien spaceships
+    game = SpaceInvadersGame(size, main_ship[0], aliens, aliens_moving, info=info,
+                             block_rows=9, block_columns=11, alien_rows=ALIEN_ROWS, alien_columns=ALIEN_COLUMNS,
+                             simulation_hz=SIMULATION_HZ, profiler=profiler, seed=GAME_SEED)
+    space_ship = game.space_ship
+    for progress in game.build_steps():
+        yield 0.55 + 0.4 * progress
+
+    if BAKE_STATIC_LAYERS:
+        background_frames = bake_static_layers(background_frames)
+        screen.bgpic(background_frames[0])
+    yield 1
+
+
+RESOLUTION = "default"  # screen resolution profile - see resolution.PROFILES (e.g. "1080p", "4k")
+size = LOGICAL_SIZE  # game size in logical units - scaled to the screen resolution
+ALIEN_ROWS = 5  # alien formation - the alien images are sized to fit it (replays use the default 5 x 11)
+ALIEN_COLUMNS = 11
+SIMULATION_HZ = 100  # game ticks per second at level 1 - increases every level
+RENDER_HZ = 60  # frames drawn per second
+PROFILE_OVERLAY = False  # show FPS, time per loop phase, tick budget and dropped ticks on screen
+PROFILE_TRACE_FILE = None  # e.g. "profile_trace.json" - Chrome trace of the last 300 frames, written at exit
+BAKE_STATIC_LAYERS = False  # draw the boundary lines into the background image
+STAR_SEED = 0  # starfield layout - starfield images are cached per screen size, seed and star style
+TWINKLE_FRAMES = 1  # starfield images cycled as the background - more than 1 makes the stars twinkle
+TWINKLE_HZ = 2  # background frames shown per second when twinkling
+GAME_SEED = None  # random seed for the game - None for a random game
+RECORD_FILE = None  # e.g. "session.rec" - records the seed and inputs, replay with: python replay.py session.rec
+TRANSITION_SECONDS = 5  # time the next level / game over text is shown for
+
+resolution = Resolution.from_name(RESOLUTION)
+entities.set_pixel_scale(resolution.scale)  # entity shapesizes are scaled to the resolution
+
+# make space invaders components - sprite images at the resolution scale, made by load_game().
+# the alien images are sized to the formation - as the aliens hitboxes are (see AlienShips.get_alien_dimensions)
+shapes = MakeShapes(size, resolution.scale, alien_size=alien_size(size, ALIEN_ROWS, ALIEN_COLUMNS))
 # background = shapes.get_bg_img()  # background for game if needed
 
 # --------------------SCREEN SETUP---------------------
 screen = Screen()
-screen.setup(size[0], size[1])
+screen.setup(*resolution.screen_size)
+if resolution.scale != 1:  # position everything in logical units
+    screen.setworldcoordinates(*resolution.world_coordinates())
 # if background:
 #     screen.bgpic(background)
 screen.title("Space Invaders")
 screen.tracer(0)
 screen.bgcolor("black")
 
-# Add background stars to screen
-draw_bg_stars(200)
-
 # ------------------TURTLE COMPONENT SETUP--------------
 # create info turtles - score, level, highscore
-info = InfoDisplay(size, HighScore.get_highscore())
+info = InfoDisplay(size, HighScore.get_highscore(), scale=resolution.scale)
 
-main_ship = select_game_icons("main_ship")  # select main ship gif file
-top_ship_mov, second_ship_mov, third_ship_mov = select_game_icons(  # select aliens ship moving gif file
-    "top_ship_moving",
-    "second_ship_moving",
-    "third_ship_moving")
-top_ship, second_ship, third_ship = select_game_icons(  # select aliens ship gif file
-    "top_ship",
-    "second_ship",
-    "third_ship")
+# opt-in profiler - times each phase of the game loop
+profiler = FrameProfiler() if PROFILE_OVERLAY or PROFILE_TRACE_FILE else None
+if PROFILE_TRACE_FILE:
+    atexit.register(profiler.dump, PROFILE_TRACE_FILE)
 
-# create main spaceship
-space_ship = MainShip(main_ship[0], size)
+# load the background, sprites and game - behind the loading page
+background_frames = []  # starfield (or baked static layer) GIF files
+game = None
+space_ship = None
+loading_page(load_game())
 
-# create block shields
-block_rows = 9
-block_columns = 11
-blocks = Blocks(size, rows=block_rows,
-                columns=block_columns)
-
-loading_page()  # add loading page - optional
-
-# create alien spaceships
-aliens = AlienShips(size, (top_ship, second_ship, third_ship),
-                    (top_ship_mov, second_ship_mov, third_ship_mov))
+# opt-in input recorder - saves the inputs of every tick, for replaying the game headless
+recorder = InputRecorder(RECORD_FILE, game.seed, SIMULATION_HZ) if RECORD_FILE else None
+if recorder:
+    atexit.register(lambda: close_recorder())  # defined below - closed after any transition finishes
 
 
 # ------------------ Functions for in-game User functionality----------------------
-def move_ship_left(scale=1):
+def queue_input(flag):
     """
-    moves ship left
+    queues a player input (move or fire flag) - applied by the next game tick
     """
-    space_ship.move_left(scale)
+    global pending_inputs
+    pending_inputs |= flag
 
 
-def move_ship_right(scale=1):
+def key_down(flag):
     """
-    moves ship right
+    a move key was pressed - its flag is held for every tick until released. Also queued, so a
+    press released before the next tick still moves the spaceship for a tick
     """
-    space_ship.move_right(scale)
+    global held_inputs
+    held_inputs |= flag
+    queue_input(flag)
 
 
-def add_shot(time_interval=0.35):
+def key_up(flag):
     """
-    adds a shot from the main user spaceship
-    - limits shooting interval using flags and timer mechanism
+    a move key was released
     """
-    global shot_fired, first_shot_timer
-    if not shot_fired:  # if no shot previously
-        space_ship.add_shot()  # add shot
-        shot_fired = True  # update shot fired
-        first_shot_timer = time.time()  # set the timer
-        return
-
-    if shot_fired:  # if shot has already been fired
-        second_shot_timer = time.time()
-        # if trying to fire within too close to first shot - stop
-        if second_shot_timer - first_shot_timer < time_interval:
-            return
-        else:  # reset flags and call function again
-            shot_fired = False
-            first_shot_timer = None
-            add_shot()
+    global held_inputs
+    held_inputs &= ~flag
 
 
 def new_game_reset():
     """
-    when user runs out of lives or spaceship passes user - resets game to base level
+    when user runs out of lives or spaceship passes user - shows the end game text while
+    the game is reset to base level
     """
-    global j, i, alien_ship_move_speed, original_speed, alien_shoot_interval, initial_shoot_interval, speed, level
-
-    aliens.switch_ships(switch=False)  # hide current aliens
-    info.end_game(level)  # display end game text
-    space_ship.remove_all_shots()  # remove spaceship shots
-    aliens.remove_all_shots()  # remove alien shots
-    screen.update()
-    HighScore.set_highscore(info.get_score())  # update saved highscore
+    game.end_game()  # hide aliens and shots, display end game text
+    HighScore.set_highscore(game.score)  # update saved highscore
     info.create_highscore(score=HighScore.get_highscore(),
                           new_score=True)  # update highscore turtle
-    time.sleep(5)
-    info.reset_info_text()  # reset all info turtle text for next game
-    aliens.reset_alien_ships()  # place aliens in starting position
-    level = 1
-    blocks.reset_bricks(rows=block_rows)  # reset block positions
-    space_ship.reset_main_ship(end_game=True)  # reset main spaceship
-
-    # reset global variables to base values
-    j = 0
-    i = 0
-    alien_ship_move_speed = 15
-    speed = 0.01
-    original_speed = speed
-    initial_shoot_interval = 20
-    alien_shoot_interval = random.randint(initial_shoot_interval, initial_shoot_interval * 2)
+    start_transition(game.new_game_steps())
 
 
 def next_level():
     """
-    when all alien ships shot - setup next game level
-    - increase alien speed
-    - reduce size of blocks
-    - increase alien shoot interval
+    when all alien ships shot - shows the next level text while the next game level is set up
     """
-    global i, j, alien_shoot_interval, initial_shoot_interval, alien_ship_move_speed, original_speed, level, speed
-    aliens.switch_ships(switch=False)  # hide current aliens
-    level += 1  # increment level counter
-    info.next_game(level)  # should be new level
-    info.create_level(updated_level=True)  # show next level info
-    aliens.remove_all_shots()  # remove all alien shots
-    screen.update()
-    time.sleep(5)
-    info.remove_next_level_text()  # reset info turtle text
-    aliens.reset_alien_ships()  # place aliens in starting position
-    blocks.reset_bricks(level)  # reset block positions - level passed to reduce block size
-    space_ship.reset_main_ship()  # reset main spaceship
-    space_ship.remove_all_shots()  # remove all spaceship shots
-
-    # Assign global variables to base values or new (next level) values
-    j = 0
-    i = 0
-    alien_ship_move_speed = 15
-    initial_shoot_interval -= 2  # decrease time for aliens to shoot
-    alien_shoot_interval = random.randint(initial_shoot_interval, initial_shoot_interval * 2)
-
-    speed *= 0.8  # increase game speed
-    original_speed = speed
+    game.end_level()  # hide aliens and shots, display next level text
+    start_transition(game.next_level_steps())
+
+
+def start_transition(steps):
+    """
+    starts a transition between levels / games - the game doesn't tick until it finishes.
+    steps: generator setting up the next level / game a step per frame (e.g. game.next_level_steps())
+    """
+    global transition, transition_progress, transition_end
+    transition = steps
+    transition_progress = 0
+    transition_end = time.perf_counter() + TRANSITION_SECONDS
+
+
+def advance_transition():
+    """
+    runs the next step of the transition - once set up, the last step (starting the
+    level / game) waits until the transition has been shown for TRANSITION_SECONDS.
+    Return: True if the transition finished
+    """
+    global transition, transition_progress, pending_inputs
+    if transition_progress >= 1 and time.perf_counter() < transition_end:
+        return False  # set up - keep showing the level / game text
+    transition_progress = next(transition, None)
+    if transition_progress is None:
+        transition = None
+        pending_inputs = 0  # drop keys pressed during the transition
+        return True
+    return False
+
+
+def close_recorder():
+    """
+    finishes any transition in progress, then closes the recording with the final game state hash -
+    a replay runs the transition to the end too, so the hashes only match once it's finished.
+    Runs at exit, after the screen may be closed (e.g. screen.bye()) - so the transition is finished
+    without the info display, whose turtles can no longer be drawn
+    """
+    global transition
+    if transition:
+        game.info = None  # finish headless - the game state doesn't depend on the info display
+        for _ in transition:
+            pass
+        transition = None
+    recorder.close(game.state_hash())
 
 
 def end_game():
@@ -217,100 +256,75 @@ def end_game():
 
 # ------------------- User keyboard interactions -------------------
 screen.listen()
-screen.onkeypress(move_ship_left, "Left")  # move left
-screen.onkeypress(lambda: move_ship_left(scale=2.3), "a")  # move left faster
-screen.onkeypress(move_ship_right, "Right")  # move right
-screen.onkeypress(lambda: move_ship_right(scale=2.3), "d")  # move right faster
-screen.onkeypress(add_shot, "space")  # add shot
+# move keys are tracked as held down / up - the spaceship moves once per tick while held
+for key, flag in (("Left", MOVE_LEFT),  # move left
+                  ("a", MOVE_LEFT_FAST),  # move left faster
+                  ("Right", MOVE_RIGHT),  # move right
+                  ("d", MOVE_RIGHT_FAST)):  # move right faster
+    screen.onkeypress(lambda flag=flag: key_down(flag), key)
+    screen.onkeyrelease(lambda flag=flag: key_up(flag), key)
+screen.onkeypress(lambda: queue_input(FIRE), "space")  # add shot - limited by the spaceship fire control
 screen.onkeypress(end_game, "q")  # quit game
 
 
 # ------------Global game variables-------------
-# flags limiting user shoot interval
-shot_fired = False
-first_shot_timer = None
-second_shot_timer = None
 play = True
+pending_inputs = 0  # player input flags queued for the next tick
+held_inputs = 0  # move flags of the keys held down - applied every tick
+transition = None  # steps setting up the next level / game - while the level / game over text shows
+transition_progress = 0  # fraction of the transition set up
+transition_end = 0  # perf_counter() time the transition can finish
 
-# flags for controlling when aliens move and when aliens shoot
-i = 0
-j = 0
-alien_ship_move_speed = 15
-initial_shoot_interval = 20
-alien_shoot_interval = random.randint(initial_shoot_interval, initial_shoot_interval * 2)
+# fixed timestep clock - runs game ticks at game.speed intervals, and renders at RENDER_HZ
+clock = FixedTimestep(render_hz=RENDER_HZ)
 
-level = 1  # initial user level
-
-speed = 0.01  # game speed
-original_speed = speed
+# draw every turtle once - the game loop then only redraws the turtles that changed
+entities.render_all()
+screen.update()
 
 
 # -----------------Game Loop Logic------------------
 while play:
 
-    # increments the counters
-    i += 1
-    j += 1
-    time.sleep(speed)
-    screen.update()  # update the screen
-
-    # if counter j greater than alien shoot interval - fire a random alien shot
-    if j > alien_shoot_interval:
-        aliens.random_shot()
-        # reset counter for shoot interval
-        j = 0
-
-    # if counter i greater than alien_ship_move_speed - move aliens
-    if i > alien_ship_move_speed:
-        hit_wall = aliens.move()
-        # check if aliens passed user
-        passed_finish = game_loop_logic.check_alien_passed_finish(aliens, space_ship)
-        if passed_finish:
-            # end game if passed user
+    # run the game ticks owed since the last loop - none during a transition
+    for _ in range(0 if transition else clock.ticks_due(game.speed)):
+        inputs, pending_inputs = pending_inputs | held_inputs, 0
+        if recorder:
+            recorder.record(inputs)
+        tick_start = time.perf_counter()
+        outcome = game.tick(inputs)  # move spaceship, aliens and shots, check collisions
+        clock.record_tick(tick_start)
+
+        if outcome == GAME_OVER:  # end game
             new_game_reset()
-        # check if alien hit blocks
-        game_loop_logic.check_alien_hit_block(aliens, blocks)
-        # switch each aliens img
-        aliens.switch_ships()
-
-        # if aliens moved and hit wall - alien speed increases
-        if hit_wall:
-            if alien_ship_move_speed > 1:
-                alien_ship_move_speed -= 1
-        # reset counter for move speed
-        i = 0
-
-    # moves spaceship shots and checks if hit block or alien
-    if space_ship.shots_fired:
-        space_ship.shot_move_up()  # move shots
-        game_loop_logic.check_shot_hit_block(space_ship.shots_fired, blocks)  # hit block interaction
-        game_loop_logic.check_passed_line(space_ship.shots_fired, info, spaceship=True)
-        hit_alien = game_loop_logic.check_shot_hit_alien(space_ship.shots_fired,
-                                                         aliens,
-                                                         space_ship)  # hit alien interaction
-
-        if hit_alien:  # increment score if hit alien
-            info.create_score(updated_score=True)
-
-    # moves alien spaceship shots and checks if hit block or user spaceship
-    if aliens.shots_fired:
-        aliens.move_shots ()  # move shots
-        game_loop_logic.check_shot_hit_block(aliens.shots_fired, blocks)  # hit block interaction
-        game_loop_logic.check_passed_line(aliens.shots_fired, space_ship)
-        more_lives = game_loop_logic.check_shot_hit_space_ship(aliens.shots_fired,
-                                                               space_ship)  # hit spaceship interaction
-
-        if not more_lives:  # if hit spaceship and no more user lives
-            new_game_reset()  # end game
-
-    # Increase speed significantly of the last alien ship
-    if aliens.last_ship:
-        if speed == original_speed:
-            alien_ship_move_speed = 0
-
-    # set up next level if all alien ships shot
-    if aliens.no_more_ships:
-        next_level()
+        elif outcome == LEVEL_COMPLETE:  # set up next level if all alien ships shot
+            next_level()
+        if outcome:
+            break
+
+    if play and clock.render_due():
+        render_start = time.perf_counter()
+        if transition and advance_transition():
+            clock.reset()  # don't catch up on the time spent in the transition
+        with game.profiler.phase("render"):
+            entities.render_all()  # sync changed entities to their turtles
+        # every frame - Tk only handles key presses and window events in update_screen(), so this
+        # runs even if nothing moved (it then only handles the events)
+        with game.profiler.phase("screen_update"):
+            entities.update_screen(screen)  # redraw the changed turtles
+        clock.record_render(render_start)
+        game.profiler.end_frame()
+
+        twinkle_period = max(RENDER_HZ // TWINKLE_HZ, 1)  # frames between background frames - at least 1
+        if len(background_frames) > 1 and clock.frames % twinkle_period == 0:  # twinkle the stars
+            screen.bgpic(background_frames[clock.frames // twinkle_period % len(background_frames)])
+            entities.update_screen(screen)
+
+        if PROFILE_OVERLAY and clock.frames % RENDER_HZ == 0:  # refresh overlay once a second
+            info.update_profile_overlay(f"{profiler.summary()}\n{clock.summary(game.speed)}")
+            entities.update_screen(screen)
+
+    clock.wait(None if transition else game.speed)  # no ticks due during a transition
 
 
 screen.mainloop()
\ No newline at end of file
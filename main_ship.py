@@ -2,87 +2,97 @@
 Class for creating and controlling main user spaceship functionality
 """
 
-from turtle import *
-from PIL import Image
+from entities import Entity, EntityPool
+from shapes import ship_size
 
 
 class MainShip:
-    def __init__(self, ship_img, screen_size):
+    def __init__(self, ship_img, screen_size, shot_pool_capacity=20, max_speed=3, acceleration=0.5,
+                 fire_cooldown=35, max_shots=3, fire_buffer=0):
 
-        self.screen_dims = screen_size  # parent screen dimensions
+        self.screen_dims = screen_size  # parent screen dimensions - logical units
         self.y_axis_main = (-self.screen_dims[1]/2) + (self.screen_dims[1]/8)  # spaceship y-axis
         self.ship_image = ship_img  # spaceship gif image
         self.ship_image_dims = self.get_img_dimensions()
 
-        self.main_ship = None  # holds the spaceship turtle object
+        self.main_ship = None  # holds the spaceship entity
         self.create_ship()
         self.main_ship_top = self.y_axis_main + self.ship_image_dims[1]/2  # spaceship top y-axis
         self.main_ship_bottom = self.y_axis_main - self.ship_image_dims[1]/2  # spaceship bottom y-axis
         self.main_ship_off_centre = self.ship_image_dims[0]/2  # spaceship x-axis offset from centre
 
+        # movement - logical units per tick, applied once per tick while a move key is held
+        self.max_speed = max_speed  # top speed (multiplied by the scale passed to move())
+        self.acceleration = acceleration  # speed gained (or lost, slowing down) per tick
+        self.velocity = 0  # current x-axis speed - negative moving left
+
         self.shots_fired = []  # holds the spaceships shots fired
         self.shot_length = 0.2
         self.shot_width = 1
+        # recycles shot entities - removed shots are returned to the pool
+        self.shot_pool = EntityPool("square", colour="white",
+                                    stretch_wid=self.shot_width,
+                                    stretch_len=self.shot_length,
+                                    capacity=shot_pool_capacity)
+
+        # fire control - in ticks, so the shots fired only depend on the inputs of each tick
+        self.fire_cooldown = fire_cooldown  # min ticks between shots
+        self.max_shots = max_shots  # max shots in flight
+        self.fire_buffer = fire_buffer  # ticks a blocked fire press waits to fire - 0 drops it
+        self.cooldown = 0  # ticks until the next shot can be fired
+        self.buffered_fire = 0  # ticks left for a blocked fire press to fire
 
         self.lives = 2  # counter for number of lives
-        self.ship_lives = self.create_ship_lives()  # create turtle lives
+        self.ship_lives = self.create_ship_lives()  # create life entities
 
-        self.boundary_line = None  # holds bottom boundary line turtle
+        self.boundary_line = None  # holds bottom boundary line entity
         self.boundary_line_y = self.y_axis_main-30
         self.create_boundary()
 
     def reset_main_ship(self, end_game=False):
         """
-        resets spaceship into starting position, and recreates turtle lives
+        resets spaceship into starting position, and recreates life entities
         """
         if end_game:  # reset lives to default
             self.lives = 2
         self.main_ship.goto(0, self.y_axis_main)  # staring position
+        self.velocity = 0
+        self.cooldown = 0
+        self.buffered_fire = 0
         for life in self.ship_lives:
-            # hide / clear life turtles
-            life.hideturtle()
-            life.clear()
-            life = None
+            life.remove()  # remove life entities
         self.ship_lives = None
         self.ship_lives = self.create_ship_lives()
 
     def remove_all_shots(self):
         """
-        remove all shot turtles
+        remove all shot entities
         """
         for i in range(len(self.shots_fired)):
-            self.shots_fired[i].hideturtle()
-            self.shots_fired[i].clear()
+            self.shots_fired[i].remove()
             self.shots_fired[i] = None
         self.shots_fired = []
 
     def get_img_dimensions(self):
         """
-        get spaceship gif img dimensions
+        get spaceship img dimensions - in logical units, from the logical img size (not the
+        rounded GIF pixels) so collisions don't change with the resolution
         """
-        img = Image.open(self.ship_image)
-        width = img.width
-        height = img.height
-        return width, height
+        return ship_size(self.screen_dims)
 
     def create_ship(self, *args):
         """
         creates ship and places it into starting position.
-        Pass a 2 length list for ship turtle with custom positions (for Life turtles)
+        Pass a 2 length list for ship entity with custom positions (for Life entities)
         """
-        turtle = Turtle()
-        turtle.shape(self.ship_image)
-        turtle.penup()
         if args:
-            turtle.goto(args[0], args[1])
-            return turtle
+            return Entity(self.ship_image, args[0], args[1])
         else:
-            turtle.goto(0, self.y_axis_main)
-            self.main_ship = turtle
+            self.main_ship = Entity(self.ship_image, 0, self.y_axis_main)
 
     def create_ship_lives(self):
         """
-        creates n ship life turtles - places at bottom left of screen with equal gaps between
+        creates n ship life entities - places at bottom left of screen with equal gaps between
         """
         ship_lives = []
         placement = self.screen_dims[0] / 17
@@ -97,53 +107,72 @@ class MainShip:
     def create_boundary(self):
         """
         creates boundary line at bottom of the screen
-        - separates the spaceship from the lives turtles
+        - separates the spaceship from the life entities
         """
-        turtle = Turtle()
-        turtle.penup()
-        turtle.shape("square")
         ratio_x = self.screen_dims[0]/20
-        turtle.shapesize(stretch_len=ratio_x,  # width of the screen
-                         stretch_wid=0.2)
-        turtle.color("green")
-        turtle.goto(0, self.boundary_line_y)
-        self.boundary_line = turtle
+        self.boundary_line = Entity("square", 0, self.boundary_line_y, colour="green",
+                                    stretch_wid=0.2,
+                                    stretch_len=ratio_x)  # width of the screen
 
     def add_shot(self):
         """
-        add a shot (turtle) from the spaceship.
+        add a shot (entity from the shot pool) from the spaceship.
         starts from the top of the main ships coordinates
         """
-        turtle = Turtle()
-        turtle.penup()
-        turtle.shape("square")
-        turtle.color("white")
-        turtle.shapesize(stretch_len=self.shot_length, stretch_wid=self.shot_width)
-        turtle.goto(self.main_ship.xcor(),
-                    self.main_ship.ycor() + (self.ship_image_dims[1]/2))  # + half height of ship img
-        self.shots_fired.append(turtle)
+        shot = self.shot_pool.acquire(self.main_ship.xcor(),
+                                      self.main_ship.ycor() + (self.ship_image_dims[1]/2))  # + half height of ship img
+        self.shots_fired.append(shot)
 
-    def move_left(self, scale=1):
+    def fire(self, pressed):
         """
-        Move space-ship to the left if spaceship img does not go passed the screen edge.
-        Scale: multiplies the distance the spaceship will move
+        Fire control - runs once per tick. Fires a shot if the fire key was pressed this tick
+        (or a blocked press is still buffered), the cooldown has passed and fewer than max_shots are in flight.
+        pressed: True if the fire key was pressed this tick
+        Return: True if a shot was fired
         """
-        if not self.main_ship.xcor() - self.ship_image_dims[0]/2 - (10*scale) < -(self.screen_dims[0]/2):
-            self.main_ship.goto(self.main_ship.xcor() - (10*scale), self.y_axis_main)
+        if self.cooldown:
+            self.cooldown -= 1
+        if pressed:
+            self.buffered_fire = self.fire_buffer + 1
+        if not self.buffered_fire:
+            return False
 
-    def move_right(self, scale=1):
+        if self.cooldown or len(self.shots_fired) >= self.max_shots:  # shot blocked
+            self.buffered_fire -= 1
+            return False
+        self.buffered_fire = 0
+        self.cooldown = self.fire_cooldown
+        self.add_shot()
+        return True
+
+    def move(self, direction, scale=1):
         """
-        Move space-ship to the right if spaceship img does not go passed the screen edge.
-        Scale: multiplies the distance the spaceship will move
+        Moves the space-ship one tick - accelerating towards top speed in direction (-1 left, 1 right),
+        or slowing to a stop if direction is 0. Stops at the screen edge.
+        Scale: multiplies the top speed
         """
-        if not self.main_ship.xcor() + self.ship_image_dims[0]/2 + (10*scale) > self.screen_dims[0]/2:
-            self.main_ship.goto(self.main_ship.xcor() + (10*scale), self.y_axis_main)
+        target_velocity = direction * self.max_speed * scale
+        if self.velocity < target_velocity:
+            self.velocity = min(self.velocity + self.acceleration, target_velocity)
+        elif self.velocity > target_velocity:
+            self.velocity = max(self.velocity - self.acceleration, target_velocity)
+        if not self.velocity:
+            return
+
+        # furthest x-axis the spaceship img can move to without passing the screen edge
+        edge_x = self.screen_dims[0]/2 - self.ship_image_dims[0]/2
+        x = self.main_ship.xcor() + self.velocity
+        if x < -edge_x or x > edge_x:  # stop at the screen edge
+            x = max(-edge_x, min(x, edge_x))
+            self.velocity = 0
+        self.main_ship.goto(x, self.y_axis_main)
 
     def shot_move_up(self, shot_move=10):
         """
         moves the shot up by default 10 pixels
         """
         for shot in self.shots_fired:
+            shot.start_y = shot.ycor()  # swept collision checks cover start_y to the new y-axis
             shot.sety(shot.ycor() + shot_move)
 
     def shot_in_range(self):
@@ -154,10 +183,9 @@ class MainShip:
         if self.lives == 0:
             return False
         self.main_ship.goto(0, self.y_axis_main)  # got to starting position
+        self.velocity = 0
         self.lives -= 1  # decrement lives
-        for life_turtle in self.ship_lives:
-            life_turtle.hideturtle()
-            life_turtle.clear()
-            life_turtle = None
+        for life in self.ship_lives:
+            life.remove()
         self.ship_lives = self.create_ship_lives()
         return True
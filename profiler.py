@@ -0,0 +1,105 @@
+"""
+Opt-in per-frame profiler for the game loop
+- each loop phase (alien march, shot movement, each collision check, rendering) is timed
+  with 'with profiler.phase(name):'
+- the phases of the last n frames are kept in a ring buffer
+- summary() gives the FPS and average time per phase - for the on-screen overlay
+- dump() writes the buffered frames as a Chrome trace file (chrome://tracing or ui.perfetto.dev)
+
+NullProfiler has the same interface and records nothing - used when profiling is off.
+"""
+
+from collections import deque
+from contextlib import contextmanager, nullcontext
+import json
+import time
+
+
+class FrameProfiler:
+    def __init__(self, history=300):
+
+        self.frames = deque(maxlen=history)  # ring buffer - (frame start, frame end, [(phase, start, duration)])
+        self.current_phases = []  # phases recorded in the current frame
+        self.frame_start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        """
+        times the code within the with block as phase 'name' of the current frame
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current_phases.append((name, start, time.perf_counter() - start))
+
+    def end_frame(self):
+        """
+        closes the current frame and adds it to the ring buffer
+        """
+        now = time.perf_counter()
+        self.frames.append((self.frame_start, now, self.current_phases))
+        self.current_phases = []
+        self.frame_start = now
+
+    def fps(self):
+        """
+        returns the frames per second over the buffered frames
+        """
+        if len(self.frames) < 2:
+            return 0
+        elapsed = self.frames[-1][1] - self.frames[0][0]
+        return len(self.frames) / elapsed if elapsed > 0 else 0
+
+    def phase_totals(self):
+        """
+        returns the average time per frame (seconds) spent in each phase, and the worst frame
+        """
+        totals = {}
+        worst = {}
+        for _, _, phases in self.frames:
+            frame_totals = {}
+            for name, _, duration in phases:
+                frame_totals[name] = frame_totals.get(name, 0) + duration
+            for name, duration in frame_totals.items():
+                totals[name] = totals.get(name, 0) + duration
+                worst[name] = max(worst.get(name, 0), duration)
+        n_frames = max(len(self.frames), 1)
+        return {name: (total / n_frames, worst[name]) for name, total in totals.items()}
+
+    def summary(self):
+        """
+        returns a text summary - FPS and the average / worst ms per phase, slowest first
+        """
+        lines = [f"FPS: {self.fps():.0f}"]
+        phase_totals = sorted(self.phase_totals().items(), key=lambda item: item[1][0], reverse=True)
+        for name, (average, worst) in phase_totals:
+            lines.append(f"{name}: {average * 1000:.3f} ms (max {worst * 1000:.3f})")
+        return "\n".join(lines)
+
+    def dump(self, file_name):
+        """
+        writes the buffered frames to a Chrome trace event JSON file
+        """
+        events = []
+        for frame_start, frame_end, phases in self.frames:
+            events.append({"name": "frame", "ph": "X", "pid": 0, "tid": 0,
+                           "ts": frame_start * 1e6, "dur": (frame_end - frame_start) * 1e6})
+            for name, start, duration in phases:
+                events.append({"name": name, "ph": "X", "pid": 0, "tid": 1,
+                               "ts": start * 1e6, "dur": duration * 1e6})
+        with open(file_name, "w") as file:
+            json.dump({"traceEvents": events}, file)
+
+
+class NullProfiler:
+    """
+    profiler that records nothing - phase() returns a shared do nothing context
+    """
+    _null_context = nullcontext()
+
+    def phase(self, name):
+        return self._null_context
+
+    def end_frame(self):
+        pass
@@ -0,0 +1,118 @@
+"""
+Input recording and replay - reproduces a played game exactly, headless and at full speed
+- a game is fully determined by its seed and the player input flags passed to each tick
+- InputRecorder writes the seed and the per tick inputs to a compact binary file,
+  run length encoded as (no. of ticks, input flags) runs - most ticks have no input
+- the recording ends with a hash of the final game state, which a replay is checked against
+- the game state is independent of the screen resolution, so a game recorded at any
+  resolution profile is replayed headless at scale 1
+
+File format (little endian):
+    header: magic b"SIRP", version (uint8), seed (uint64), simulation hz (uint16)
+    runs:   no. of ticks (uint16), input flags (uint8) - repeated
+    footer: a run of 0 ticks, then the 20 byte SHA1 game state hash
+
+Replay a recording (e.g. one saved by main.py with RECORD_FILE set):
+    python replay.py session.rec
+"""
+
+import argparse
+import struct
+from game import make_headless_game, run_headless
+
+MAGIC = b"SIRP"
+VERSION = 3  # 2 - move flags are held keys, 3 - shots limited by the spaceship fire control
+HEADER = struct.Struct("<4sBQH")
+RUN = struct.Struct("<HB")
+MAX_RUN = 0xFFFF  # max ticks per run
+
+
+class InputRecorder:
+    def __init__(self, file_name, seed, simulation_hz):
+
+        self.file = open(file_name, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, simulation_hz))
+
+        # current run - no. of ticks with the same inputs
+        self.run_inputs = 0
+        self.run_ticks = 0
+
+    def record(self, inputs):
+        """
+        records the input flags passed to a single tick
+        """
+        if inputs != self.run_inputs or self.run_ticks == MAX_RUN:
+            self.write_run()
+            self.run_inputs = inputs
+        self.run_ticks += 1
+
+    def write_run(self):
+        """
+        writes the current run, if any ticks
+        """
+        if self.run_ticks:
+            self.file.write(RUN.pack(self.run_ticks, self.run_inputs))
+            self.run_ticks = 0
+
+    def close(self, state_hash):
+        """
+        writes the last run and the final game state hash, and closes the file
+        """
+        if self.file.closed:
+            return
+        self.write_run()
+        self.file.write(RUN.pack(0, 0))
+        self.file.write(bytes.fromhex(state_hash))
+        self.file.close()
+
+
+def read_recording(file_name):
+    """
+    reads a recording.
+    Return: seed, simulation hz, input flags per tick (bytearray), final game state hash (None if not closed)
+    """
+    with open(file_name, "rb") as file:
+        data = file.read()
+
+    magic, version, seed, simulation_hz = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{file_name} is not a version {VERSION} recording")
+
+    inputs = bytearray()
+    state_hash = None
+    offset = HEADER.size
+    while offset + RUN.size <= len(data):
+        ticks, run_inputs = RUN.unpack_from(data, offset)
+        offset += RUN.size
+        if ticks == 0:  # footer
+            state_hash = data[offset:offset + 20].hex()
+            break
+        inputs.extend(bytes([run_inputs]) * ticks)
+    return seed, simulation_hz, inputs, state_hash
+
+
+def replay(file_name):
+    """
+    replays a recording headless at full speed.
+    Return: the replayed game, ticks per second, and True / False if the final game state
+    matches the recording (None if the recording has no final state)
+    """
+    seed, simulation_hz, inputs, state_hash = read_recording(file_name)
+    game = make_headless_game(seed=seed, simulation_hz=simulation_hz)
+    ticks_per_second = run_headless(game, len(inputs), inputs)
+    matches = game.state_hash() == state_hash if state_hash else None
+    return game, ticks_per_second, matches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a recorded space invaders game headless")
+    parser.add_argument("recording", help="recording file (see RECORD_FILE in main.py)")
+    args = parser.parse_args()
+
+    game, ticks_per_second, matches = replay(args.recording)
+    print(f"replayed seed {game.seed} - {ticks_per_second:.0f} ticks/s")
+    print(f"level {game.level}, score {game.score}, lives {game.space_ship.lives}")
+    if matches is None:
+        print("recording has no final state - not checked")
+    else:
+        print("final state matches recording" if matches else "final state DIFFERS from recording")
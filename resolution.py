@@ -0,0 +1,73 @@
+"""
+Resolution profiles - the game is played in a fixed logical coordinate space and scaled to the screen
+- all game geometry, movement and collision checks use logical units (LOGICAL_SIZE - 1000 x 800)
+- a profile maps logical units to screen pixels with a single uniform scale, so nothing is stretched -
+  on screens of a different aspect ratio the logical space is centred, with extra space at the sides
+- the turtle screen is set to world coordinates in logical units, so entities are positioned in
+  logical units, and only the pixel sizes (sprite images, shapesizes, fonts) use the scale.
+  World coordinates map onto a canvas TURTLE_MARGIN pixels smaller than the window, so the scale
+  is fitted to the canvas - both axes then use exactly the scale
+- sprite images are generated at their logical size x scale, so they are sharp at every resolution
+"""
+
+LOGICAL_SIZE = (1000, 800)  # width and height of the game in logical units
+TURTLE_MARGIN = 20  # pixels turtle's setworldcoordinates() takes from the window size for the canvas
+
+# screen pixel sizes of the named profiles
+PROFILES = {
+    "default": (1000, 800),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+}
+
+
+class Resolution:
+    def __init__(self, screen_size=LOGICAL_SIZE, logical_size=LOGICAL_SIZE):
+
+        self.screen_size = screen_size  # screen (w, h) pixels
+        self.logical_size = logical_size  # game (w, h) logical units
+
+        # canvas (w, h) pixels world coordinates are mapped onto - the logical size is drawn 1:1
+        # without world coordinates, so uses the whole screen
+        if tuple(screen_size) == tuple(logical_size):
+            self.canvas_size = tuple(screen_size)
+        else:
+            self.canvas_size = (screen_size[0] - TURTLE_MARGIN, screen_size[1] - TURTLE_MARGIN)
+
+        # pixels per logical unit - the largest uniform scale fitting the logical space on the canvas
+        self.scale = min(self.canvas_size[0] / logical_size[0], self.canvas_size[1] / logical_size[1])
+
+    @classmethod
+    def from_name(cls, name):
+        """
+        returns the resolution for a named profile (see PROFILES)
+        """
+        return cls(PROFILES[name])
+
+    def to_pixels(self, length):
+        """
+        returns a length in logical units as screen pixels
+        """
+        return length * self.scale
+
+    def to_logical(self, pixels):
+        """
+        returns a length in screen pixels as logical units
+        """
+        return pixels / self.scale
+
+    def world_size(self):
+        """
+        returns the (w, h) logical units visible on the canvas - at least the logical size
+        """
+        return self.to_logical(self.canvas_size[0]), self.to_logical(self.canvas_size[1])
+
+    def world_coordinates(self):
+        """
+        returns the (left x, bottom y, right x, top y) screen edges in logical units - for
+        screen.setworldcoordinates(), keeping the logical origin at the screen centre
+        """
+        width, height = self.world_size()
+        return -width / 2, -height / 2, width / 2, height / 2
@@ -1,59 +1,85 @@
 """
 class to create all space invaders components as transparent GIF images
 - also able to create a Gif background for the game.
+
+Each component is built directly from its pixels matrix - a 2 colour palette image
+(transparent background + component colour) upscaled with nearest neighbour resampling.
+No display is needed to create the images.
+
+Created images are cached in the img folder, named by a hash of the component dictionary
+and image size, and recorded in a manifest file. Only components whose definition or size
+changed are recreated - images for other sizes are kept alongside. Several processes can
+fill the cache at once (e.g. batch workers) - see save_atomic().
+
+Component sizes are defined in logical units (see resolution.py) - the image pixel sizes are
+the logical sizes multiplied by the resolution scale.
 """
 
-from turtle import *
-from PIL import Image, ImageOps
+from PIL import Image, ImageColor
+import hashlib
+import json
 import os
-import shutil
 import sys
+import tempfile
 
 
 ship_ratio = 11/15
 ships_per_row = 17
 
 
-def make_transparent_black_background(img):
+def ship_size(size, per_row=ships_per_row):
     """
-    Converts the img to have a transparent layer - where the transparent layer is
-    by default 'black' (0, 0, 0)
+    returns the (w, h) of a ship img in logical units - the screen width and height / ships per row,
+    times the ship ratio. The images are made at this size x scale - collisions use it unrounded,
+    so they are the same at every resolution
     """
-    img = img.convert("RGBA")
-    data = img.getdata()
+    return (size[0] / per_row) * ship_ratio, (size[1] / per_row) * ship_ratio
 
-    new_pixel_data = []
-    for item in data:
-        if item[:3] == (0, 0, 0):  # black colour
-            # add '0' to the alpha channel with black colour
-            new_pixel_data.append((0, 0, 0, 0))
-        else:
-            new_pixel_data.append(item)
-    img.putdata(new_pixel_data)  # update the img
 
-    return img
+def save_atomic(path, write):
+    """
+    writes a file via a uniquely named temporary file in the same folder, then renames it into place -
+    so an interrupted write never leaves a half written file, and processes writing the same file at
+    once never share a temporary file (the last rename wins, each leaving a whole file).
+    write: function writing the file contents to the path it is given
+    """
+    fd, temp_file = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path) or ".")
+    os.close(fd)
+    try:
+        write(temp_file)
+        os.chmod(temp_file, 0o644)  # mkstemp files are only readable by the owner
+        os.replace(temp_file, path)
+    except BaseException:
+        os.remove(temp_file)
+        raise
+
+
+def inverted_colour(colour):
+    """
+    returns the RGB inverse of a colour name - components are drawn in the inverse
+    of their 'colour' (e.g. 'blue' gives a yellow component)
+    """
+    return tuple(255 - channel for channel in ImageColor.getrgb(colour))
 
 
 class MakeShapes:
-    def __init__(self, size):
-        self.screen_size = size  # screen size for main game screen
-        self.square_size_small = 80
-        self.square_size_large = 40
-
-        self.screen = Screen()  # screen for creating component shapes
-        self.turtle = Turtle()  # for drawing shapes
-        self.turtle.speed("fastest")
-        self.turtle.penup()
-        self.turtle.hideturtle()
-
-        # for holding intermediate and final GIF images, anc GIF bg
-        self.temp_folder = "./temp_folder"
+    def __init__(self, size, scale=1, alien_size=None):
+        self.screen_size = size  # logical size of the main game screen
+        self.scale = scale  # image pixels per logical unit
+
+        # for holding final GIF images, and GIF bg
         self.img_folder = "./game_icons"
         self.bg_img_folder = "./background_images"
 
-        # for gif img width and height - relative to no. ships per row and col
-        self.ship_x_scaled = (self.screen_size[0]/ships_per_row) * ship_ratio
-        self.ship_y_scaled = (self.screen_size[1]/ships_per_row) * ship_ratio
+        # for gif img width and height (pixels) - relative to no. ships per row and col
+        ship_w, ship_h = ship_size(self.screen_size)
+        self.ship_x_scaled = ship_w * self.scale
+        self.ship_y_scaled = ship_h * self.scale
+        # alien img (w, h) logical units - sized to the alien formation spacing (alien_ships_2.alien_size),
+        # the main ship size for the default formation
+        alien_w, alien_h = alien_size or (ship_w, ship_h)
+        self.alien_x_scaled = alien_w * self.scale
+        self.alien_y_scaled = alien_h * self.scale
 
         self.shapes = []  # holds game components dictionaries
 
@@ -63,8 +89,8 @@ class MakeShapes:
             "rows": 8,
             "columns": 8,
             "colour": "blue",  # initial colour before inverting
-            "scale_w": self.ship_x_scaled,  # final pixels width of img
-            "scale_h": self.ship_y_scaled,  # final pixels height of img
+            "scale_w": self.alien_x_scaled,  # final pixels width of img
+            "scale_h": self.alien_y_scaled,  # final pixels height of img
             "pixels": [  # squares to be drawn
                 [0, 0, 0, 1, 1, 0, 0, 0],
                 [0, 0, 1, 1, 1, 1, 0, 0],
@@ -83,8 +109,8 @@ class MakeShapes:
             "rows": 8,
             "columns": 8,
             "colour": "blue",
-            "scale_w": self.ship_x_scaled,
-            "scale_h": self.ship_y_scaled,
+            "scale_w": self.alien_x_scaled,
+            "scale_h": self.alien_y_scaled,
             "pixels": [
                 [0, 0, 0, 1, 1, 0, 0, 0],
                 [0, 0, 1, 1, 1, 1, 0, 0],
@@ -102,8 +128,8 @@ class MakeShapes:
             "rows": 8,
             "columns": 11,
             "colour": "cyan",
-            "scale_w": self.ship_x_scaled,
-            "scale_h": self.ship_y_scaled,
+            "scale_w": self.alien_x_scaled,
+            "scale_h": self.alien_y_scaled,
             "pixels": [
                 [0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0],
                 [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0],
@@ -121,8 +147,8 @@ class MakeShapes:
             "rows": 8,
             "columns": 11,
             "colour": "cyan",
-            "scale_w": self.ship_x_scaled,
-            "scale_h": self.ship_y_scaled,
+            "scale_w": self.alien_x_scaled,
+            "scale_h": self.alien_y_scaled,
             "pixels": [
                 [0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0],
                 [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0],
@@ -140,8 +166,8 @@ class MakeShapes:
             "rows": 8,
             "columns": 12,
             "colour": "red",
-            "scale_w": self.ship_x_scaled,
-            "scale_h": self.ship_y_scaled,
+            "scale_w": self.alien_x_scaled,
+            "scale_h": self.alien_y_scaled,
             "pixels": [
                 [0, 0, 0, 0, 1, 1, 1, 1, 0, 0, 0, 0],
                 [0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0],
@@ -159,8 +185,8 @@ class MakeShapes:
             "rows": 8,
             "columns": 12,
             "colour": "red",
-            "scale_w": self.ship_x_scaled,
-            "scale_h": self.ship_y_scaled,
+            "scale_w": self.alien_x_scaled,
+            "scale_h": self.alien_y_scaled,
             "pixels": [
                 [0, 0, 0, 0, 1, 1, 1, 1, 0, 0, 0, 0],
                 [0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0],
@@ -192,8 +218,8 @@ class MakeShapes:
         }
         self.shapes.append(main_ship)
 
-        # flag indicating if the img folder has been made and populated
-        self.images_created = self.icon_folder()
+        # cache manifest - maps each component and image size to its hash and GIF file
+        self.manifest_file = os.path.join(self.img_folder, "manifest.json")
 
     def get_bg_img(self):
         """
@@ -215,155 +241,126 @@ class MakeShapes:
                     img = Image.open(img_file)
                     name = img_file.split('.')[0]
                     img = img.convert("RGB")
-                    img = img.resize((self.screen_size[0], self.screen_size[1]))
+                    img = img.resize((int(round(self.screen_size[0] * self.scale)),
+                                      int(round(self.screen_size[1] * self.scale))))
                     gif_file = f"{self.bg_img_folder}/{name}.gif"
                     img.save(gif_file, format="GIF")
                     return gif_file
         return None
 
-    def temp_file(self, destroy=False):
+    def get_images(self):
         """
-        either creates the temporary img folder for turtle shape images.
-        If called with destroy=True then it destroys the temporary folder
+        Returns a list of game component GIF img files - one per component.
+        Components with a cached image matching their current definition and size are reused,
+        any others are made from their pixels matrix and saved as GIF images.
         """
-        if not os.path.isdir(self.temp_folder):
-            os.mkdir(self.temp_folder)  # create
-        if destroy:
-            shutil.rmtree(self.temp_folder)  # destroy
+        return list(self.iter_images())
 
-    def get_images(self):
+    def iter_images(self):
         """
-        Returns a list of game component GIF img files.
-        If previously created - returns the list from the img folder.
-        If not previously created - the components are drawn, saved, and converted to
-            GIF images and then the list if GIF files is returned.
+        Yields the GIF img file of each game component, as in get_images(), once made or checked -
+        so the work can be spread over frames (e.g. a loading page). The manifest is saved after
+        the last component, so the generator must be run to the end.
         """
-        if self.images_created:  # GIF files already created
-            files = []
-            for file in os.listdir(self.img_folder):
-                path = os.path.join(self.img_folder, file)
-                files.append(path)
-            return files  # return GIF files
-        else:  # Need to create the GIF files
-            self.make_icon_folder()   # create temporary img folder
-
-            # for displaying progress info to user
-            loading_length = 100/len(self.shapes)
-            progress_unit = 0
-
-            for shape in self.shapes:
+        self.make_icon_folder()  # create img folder if needed
+        manifest = self.load_manifest()
+
+        # for displaying progress info to user
+        loading_length = 100/len(self.shapes)
+        progress_unit = 0
+
+        manifest_updates = {}  # entries of the images made by this call
+        for shape in self.shapes:
+            width, height = self.target_size(shape)
+            key = f"{shape['name']}@{width}x{height}"  # one entry per component and image size
+            shape_hash = self.shape_hash(shape)
+            path = os.path.join(self.img_folder, f"{shape['name']}_{shape_hash}.gif")
+
+            entry = manifest.get(key)
+            if not (entry and entry["hash"] == shape_hash and os.path.isfile(path)):
                 # for displaying progress info to user
                 sys.stdout.write(f"\rStatus: {str(int(round(progress_unit, 0)))}%")
                 sys.stdout.flush()
 
-                self.turtle.clear()
+                img = self.make_image(shape)
+                save_atomic(path, lambda file: img.save(file, format="GIF", transparency=0))
+                if entry and entry["file"] != os.path.basename(path):
+                    self.remove_stale_image(entry["file"])  # outdated image of this component and size
+                manifest_updates[key] = {"hash": shape_hash, "file": os.path.basename(path)}
 
-                square_size = self.square_size_small
-                # if shape["name"] == "block":
-                #     square_size = self.square_size_large
+            yield path
+            # update the progress
+            progress_unit += loading_length
 
-                # make shape screen the dimension of the resulting img to be drawn
-                self.screen.setup(width=shape['columns'] * square_size + 5,
-                             height=shape["rows"] * square_size + 5)
-                self.screen.screensize(shape['columns'] * square_size,
-                                  shape["rows"] * square_size)
+        if manifest_updates:
+            self.save_manifest(manifest_updates)
 
-                # go to the top left of the screen
-                self.turtle.goto(x=-(self.screen.window_width() / 2),
-                                 y=self.screen.window_height() / 2)
-
-                # draw the spaceship
-                self.draw_spaceship(shape, square_size)
-
-                # update the progress
-                progress_unit += loading_length
+    def target_size(self, shape):
+        """
+        returns the final (width, height) pixels of the shapes image
+        """
+        return (int(round(shape["scale_w"])),
+                int(round(shape["scale_h"])))
 
-            # after all GIF images have been created
-            self.temp_file(destroy=True)  # destroy temp folder
-            self.turtle.clear()
-            self.images_created = True
-            return self.get_images()  # call the function within to return list of GIF images
+    def shape_hash(self, shape):
+        """
+        returns a short hash of the component dictionary and its image size - changes if
+        any pixel, colour or the size changes
+        """
+        content = json.dumps({"shape": shape, "size": self.target_size(shape)}, sort_keys=True)
+        return hashlib.sha256(content.encode()).hexdigest()[:12]
 
-    def draw_spaceship(self, shape, square_size):
+    def load_manifest(self):
         """
-        Draws the passed shape - by iterating over the shapes pixels 2D array,
-        and drawing squares at valid points.
+        returns the cache manifest - empty if missing or unreadable
         """
-        # get initial coordinates
-        initial_x = self.turtle.xcor()
-        initial_y = self.turtle.ycor()
-
-        for i in range(shape["rows"]):  # for each row
-            for j in range(shape["columns"]):  # for each column
-                # if a 'draw' signal ('1')
-                if shape["pixels"][i][j] == 1:
-                    # draw square - increments the x-axis of the turtle
-                    self.draw_square(shape["colour"], j, shape["columns"], square_size)
-                else:
-                    # pass to draw square - but will not draw square
-                    self.draw_square('white', j, shape["columns"], square_size)
-
-            initial_y -= square_size  # decrements the y-axis
-            self.turtle.goto(initial_x, initial_y)  # starting position for new row
-
-        # size of final image
-        target_size = (
-            int(round(shape["scale_w"])),
-            int(round(shape["scale_h"])))
-
-        self.temp_file()
-        cv = self.screen.getcanvas()  # get screenshot
-        # save as a postscript file to temporary folder
-        cv.postscript(file=f"{self.temp_folder}/{shape["name"]}.ps", colormode='color')
-        # convert to GIF image from postscript
-        self.convert_to_gif(f"{self.temp_folder}/{shape["name"]}.ps", target_size)
-
-    def draw_square(self, colour, j, column_limit, square_size):
+        try:
+            with open(self.manifest_file, "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save_manifest(self, updates):
         """
-        Draws a turtle square and fills with colour passed if colours is not white.
-        Moves turtle forward if not at the screen limit.
+        merges the updated entries into the manifest on disk, and writes it (see save_atomic()).
+        The manifest is reloaded just before writing, so entries saved by another process in the
+        meantime are kept. An entry lost to a process writing at the same instant only means its
+        image is made again next time.
         """
-        _turtle = self.turtle
-        if colour != "white":
-            _turtle.setheading(0)
-            _turtle.pendown()
-            _turtle.pencolor(colour)
-            _turtle.fillcolor(colour)
-            _turtle.begin_fill()
-            for _ in range(4):
-                _turtle.forward(square_size)
-                _turtle.right(90)
-            _turtle.end_fill()
-            _turtle.penup()
-        if j != column_limit-1:
-            _turtle.forward(square_size)
-
-    def convert_to_gif(self, path, targ_size):
+        manifest = self.load_manifest()
+        manifest.update(updates)
+
+        def write(file_name):
+            with open(file_name, "w") as file:
+                json.dump(manifest, file, indent=2, sort_keys=True)
+
+        save_atomic(self.manifest_file, write)
+
+    def remove_stale_image(self, file_name):
         """
-        Converts img file to GIF
+        removes an outdated cached image
         """
-        name = path.split('/')[2].split('.')[0]
-        img = Image.open(path)
-        img = img.convert("RGB")
-        img = img.resize(targ_size)
-        img_inv = ImageOps.invert(img)
-        img_transparent = make_transparent_black_background(img_inv)  # transparent bg
-        img_transparent.save(f"{self.img_folder}/{name}.gif", format="GIF")
-
-    def icon_folder(self):
+        try:
+            os.remove(os.path.join(self.img_folder, file_name))
+        except FileNotFoundError:
+            pass
+
+    def make_image(self, shape):
         """
-        Checks whether the GIF component images have been created
+        Makes the shapes image from its pixels matrix - a 1 pixel per square palette image
+        (index 0 transparent, index 1 the inverted shape colour) resized to the shapes scale
+        with nearest neighbour resampling, so squares keep hard edges.
         """
-        if os.path.isdir(self.img_folder):
-            if len(os.listdir(self.img_folder)) > 0:
-                return True
-            return False
-        return False
+        img = Image.new("P", (shape["columns"], shape["rows"]), 0)
+        img.putpalette([0, 0, 0, *inverted_colour(shape["colour"])])
+        img.putdata([pixel for row in shape["pixels"] for pixel in row])
+
+        return img.resize(self.target_size(shape), Image.NEAREST)
 
     def make_icon_folder(self):
         """
         creates the GIF img folder
         """
-        os.mkdir(self.img_folder)
+        os.makedirs(self.img_folder, exist_ok=True)
 
 